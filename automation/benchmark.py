@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark for the automation pipeline
+
+Measures daily-update.py and weekly-newsletter.py without touching Dev.to,
+hnrss.org, Reddit, Gemini or the Waitlist API:
+
+  - feeds are replayed from automation/fixtures/*.xml by a local stub HTTP
+    server (with ETag support, so warm runs exercise the 304 path); the
+    same server answers the newsletter API endpoints
+  - google.generativeai is replaced by a deterministic fake GenerativeModel
+    with configurable latency
+  - synthetic tip archives (1k / 10k / 100k tips by default) are generated
+    from the real tips in a temporary directory
+
+For every archive size the daily pipeline runs twice (cold: empty .cache,
+warm: caches from the cold run) followed by the newsletter steps. Each stage
+is reported with its wall time, throughput and peak traced memory, and the
+whole result is written as JSON so runs can be compared:
+
+    python automation/benchmark.py --sizes 1000 10000
+    python automation/benchmark.py --compare .cache/benchmark-previous.json
+
+The stub server can also run on its own, for trying weekly-newsletter.py
+end to end offline:
+
+    python automation/benchmark.py --serve 8765
+    WAITLIST_API_URL=http://127.0.0.1:8765 python automation/weekly-newsletter.py
+
+Memory is measured with tracemalloc, which makes allocation-heavy stages
+(near-duplicate hashing) several times slower; pass --no-tracemalloc for
+timing-only runs.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+AUTOMATION_DIR = Path(__file__).resolve().parent
+REPO_ROOT = AUTOMATION_DIR.parent
+FIXTURES_DIR = AUTOMATION_DIR / "fixtures"
+sys.path.insert(0, str(AUTOMATION_DIR))
+
+import run_metrics  # noqa: E402
+import search_index  # noqa: E402
+import tip_store  # noqa: E402
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+PROMPT_ITEM = re.compile(r'^\[(t\d+)\]\nContent: (.*?)(?:\n\n|\Z)', re.MULTILINE | re.DOTALL)
+
+
+def load_script(name: str, filename: str) -> types.ModuleType:
+    """Import one of the hyphenated automation scripts as a module."""
+    spec = importlib.util.spec_from_file_location(name, AUTOMATION_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =============================================================================
+# STUB SERVER
+# =============================================================================
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves feed fixtures under /feeds/<source>/<key> and the newsletter API.
+
+    The newsletter endpoints (/api/<project>/newsletter/...) behave like the
+    Waitlist API: stats, create issue, send and issue status. Sends are
+    delivered in the background after send_delay seconds, and an
+    Idempotency-Key that was seen before returns the earlier result. The first
+    `faults` POSTs are processed but answered with a 503, like a response
+    lost on the way back.
+    """
+
+    latency = 0.0
+    send_delay = 0.0
+    recipients = 1000
+    faults = 0
+    fixtures: Dict[str, bytes] = {}
+    issues: Dict[str, dict] = {}
+    keys: Dict[str, str] = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status: int, data: dict):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def issue_state(self, issue: dict) -> dict:
+        if issue["status"] == "sending" and time.monotonic() >= issue["deliver_at"]:
+            issue["status"] = "sent"
+        state = {"id": issue["id"], "status": issue["status"]}
+        if issue["status"] == "sent":
+            state["sent"] = StubHandler.recipients
+        return state
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parts = self.path.split("?")[0].strip("/").split("/")
+
+        if parts[0] == "feeds" and len(parts) >= 2 and parts[1] in self.fixtures:
+            body = self.fixtures[parts[1]]
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+        elif parts[-2:] == ["newsletter", "stats"]:
+            self.send_json(200, {"success": True, "data": {"issues": {"total_issues": len(StubHandler.issues)}}})
+        elif len(parts) >= 2 and parts[-2] == "issues" and parts[-1] in StubHandler.issues:
+            with StubHandler.lock:
+                state = self.issue_state(StubHandler.issues[parts[-1]])
+            self.send_json(200, {"success": True, "data": state})
+        else:
+            self.send_json(404, {"success": False})
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        parts = self.path.split("?")[0].strip("/").split("/")
+        key = self.headers.get("Idempotency-Key")
+
+        with StubHandler.lock:
+            if key and key in StubHandler.keys:
+                status, data = 200, {"success": True, "data": StubHandler.keys[key]}
+            elif parts[-2:] == ["newsletter", "issues"]:
+                issue = {"id": f"issue-{len(StubHandler.issues) + 1}", "status": "draft"}
+                StubHandler.issues[issue["id"]] = issue
+                status, data = 200, {"success": True, "issue": {"id": issue["id"]}}
+            elif parts[-1] == "send" and parts[-2] in StubHandler.issues:
+                issue = StubHandler.issues[parts[-2]]
+                if issue["status"] == "draft":
+                    issue["status"] = "sending"
+                    issue["deliver_at"] = time.monotonic() + StubHandler.send_delay
+                status, data = 202, {"success": True, "data": self.issue_state(issue)}
+            else:
+                self.send_json(404, {"success": False})
+                return
+
+            if key:
+                StubHandler.keys[key] = data.get("data") or data["issue"]
+            if StubHandler.faults > 0:
+                StubHandler.faults -= 1
+                status, data = 503, {"success": False, "error": "stub fault"}
+        self.send_json(status, data)
+
+
+def start_stub_server(latency: float, port: int = 0) -> ThreadingHTTPServer:
+    StubHandler.latency = latency
+    StubHandler.fixtures = {path.stem: path.read_bytes() for path in FIXTURES_DIR.glob("*.xml")}
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# =============================================================================
+# FAKE GEMINI
+# =============================================================================
+
+
+class FakeResponse:
+    def __init__(self, text: str, tokens: int):
+        self.text = text
+        self.usage_metadata = types.SimpleNamespace(total_token_count=tokens)
+
+
+class FakeGenerativeModel:
+    """Deterministic stand-in for genai.GenerativeModel.
+
+    Accepts items that mention Claude and have some substance; the category
+    comes from a few keywords. Every call sleeps for `latency` seconds.
+    """
+
+    latency = 0.0
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        time.sleep(self.latency)
+        verdicts = []
+        for tip_id, content in PROMPT_ITEM.findall(prompt):
+            text = content.lower()
+            if "subagent" in text or "agents" in text:
+                category = "subagents"
+            elif "context" in text or "claude.md" in text or "memory" in text:
+                category = "context-management"
+            elif "mcp" in text or "hook" in text or "statusline" in text:
+                category = "tooling"
+            elif "parallel" in text or "worktree" in text or "tmux" in text:
+                category = "orchestration"
+            else:
+                category = "workflow"
+            valid = "claude" in text and len(content) > 80
+            verdicts.append({
+                "id": tip_id,
+                "is_valid": valid,
+                "quality": 8 if valid else 3,
+                "category": category,
+                "title": content[:50],
+                "summary": content[:150]
+            })
+        text = json.dumps(verdicts)
+        return FakeResponse(text, (len(prompt) + len(text)) // 4)
+
+
+def install_fake_gemini(latency: float):
+    FakeGenerativeModel.latency = latency
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda api_key=None: None
+    genai.GenerativeModel = FakeGenerativeModel
+    try:
+        import google
+    except ImportError:
+        google = types.ModuleType("google")
+        google.__path__ = []
+        sys.modules["google"] = google
+    google.generativeai = genai
+    sys.modules["google.generativeai"] = genai
+    os.environ["GEMINI_API_KEY"] = "benchmark"
+
+
+# =============================================================================
+# SYNTHETIC ARCHIVE
+# =============================================================================
+
+
+def build_archive(root: Path, size: int, seed: int = 0):
+    """Write a repo skeleton with `size` synthetic tips under root.
+
+    Tips are real tips from this repository with a random extra sentence,
+    so keyword, categorizer and near-duplicate behaviour stays realistic.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "tips" / "categories").mkdir(parents=True, exist_ok=True)
+    shutil.copy(REPO_ROOT / "README.md", root / "README.md")
+
+    records = tip_store.load_bodies(tip_store.load_records(REPO_ROOT), REPO_ROOT)
+    rng = random.Random(seed)
+    vocabulary = sorted({word for record in records for word in re.findall(r'[a-z]{4,}', record["body"].lower())})
+
+    by_category = {}
+    for record in records:
+        by_category.setdefault(record["category"], []).append(record)
+
+    files = {}
+    for category, category_records in by_category.items():
+        data = (REPO_ROOT / category_records[0]["file"]).read_bytes().decode("utf-8")
+        files[category] = {
+            "header": data[:category_records[0]["start"]],
+            "footer": data[max(r["end"] for r in category_records):],
+            "entries": []
+        }
+
+    for number in range(1, size + 1):
+        template = rng.choice(records)
+        lines = [line for line in template["body"].rstrip().splitlines() if not line.startswith("[Original]")]
+        while lines and lines[-1].strip() in ("", "---"):
+            lines.pop()
+        variant = " ".join(rng.choice(vocabulary) for _ in range(12)).capitalize() + "."
+        files[template["category"]]["entries"].append(
+            f"## {number}. {template['title']} {rng.choice(vocabulary)}\n"
+            + "\n".join(lines)
+            + f"\n\n{variant}\n\n[Original](https://example.com/synthetic/{number}) | Added: 2026-01-01\n\n---\n\n"
+        )
+
+    archive = []
+    for category, parts in files.items():
+        text = parts["header"] + "".join(parts["entries"]) + parts["footer"]
+        (root / "tips" / "categories" / f"{category}.md").write_text(text)
+        archive.extend(tip_store.parse_category(text.encode(), category))
+
+    # A matching index, as a daily run would leave it (without priming .cache)
+    with open(REPO_ROOT / "tips" / "index.json") as f:
+        previous = json.load(f)
+    index = tip_store.build_index(archive, previous)
+    (root / "tips" / "index.json").write_text(tip_store.dump_index(index))
+
+
+# =============================================================================
+# RUNS
+# =============================================================================
+
+
+def point_sources_at(daily, base_url: str):
+    """Rewrite every source adapter to fetch its fixture from the stub server."""
+    from dataclasses import replace
+
+    for i, source in enumerate(daily.SOURCES):
+        stub = replace(source, url=lambda key, name=source.name: f"{base_url}/feeds/{name}/{quote(key)}")
+        daily.SOURCES[i] = stub
+        daily.SOURCES_BY_NAME[source.name] = stub
+
+
+def configure_daily(daily, root: Path):
+    for source in daily.SOURCES:
+        # Fixtures are recorded once; never let them age out of max_age_days
+        daily.CONFIG[source.name]["max_age_days"] = 36500
+    daily.CONFIG["cache"]["dir"] = str(root / ".cache")
+    daily.CONFIG["gemini"]["rpm"] = 1000000
+    daily.CONFIG["gemini"]["tpm"] = 10 ** 9
+    daily.CONFIG["http"]["default_rate"] = (10000.0, 1000)
+
+
+def run_daily(daily, label: str) -> dict:
+    """One run_pipeline() with fresh metrics and in-process caches."""
+    daily.METRICS = run_metrics.RunMetrics(f"daily-update ({label})")
+    daily._feed_cache = None
+    daily._gemini_pool = None
+    for cached in (daily.keyword_matcher, daily.source_filters, daily.tip_categorizer):
+        cached.cache_clear()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        daily.run_pipeline()
+    return daily.METRICS.report()
+
+
+def run_newsletter(newsletter, root: Path, base_url: str) -> dict:
+    """Time the weekly newsletter steps against the synthetic archive and stub API."""
+    newsletter.REPO_ROOT = root
+    newsletter.API_BASE = base_url
+    newsletter._api = newsletter.newsletter_client.NewsletterClient(base_url, newsletter.PROJECT_ID, poll_interval=0.05)
+    metrics = run_metrics.RunMetrics("weekly-newsletter")
+    random.seed(0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with metrics.stage("load_tips") as stage:
+            tips = newsletter.load_tips()
+            stage["items_out"] = len(tips)
+        with metrics.stage("select_tips", items_in=len(tips)) as stage:
+            selected = newsletter.select_tips(tips)
+            stage["items_out"] = len(selected)
+        with metrics.stage("load_contents", items_in=len(selected)):
+            selected = newsletter.load_contents(selected)
+        with metrics.stage("issue_number"):
+            issue_number = newsletter.get_next_issue_number()
+        with metrics.stage("generate_html", items_in=len(selected)) as stage:
+            html = newsletter.generate_html(selected, issue_number)
+            text = newsletter.generate_text(selected, issue_number)
+            stage["bytes_out"] = len(html.encode()) + len(text.encode())
+        fragments = newsletter.fragment_cache()
+        metrics.cache("fragments", hits=fragments.hits, misses=fragments.misses)
+        with metrics.stage("send") as stage:
+            stage["ok"] = newsletter.create_and_send_issue(f"Benchmark #{issue_number}", html, text)
+            stage.update(newsletter.api_client().timings)
+    return metrics.report()
+
+
+SEARCH_QUERIES = ("git worktree parallel", "claude.md memory", "hooks notification", "subagent review",
+                  "context window compact", "mcp server", "plan mode", "tmux sessions", "slash command", "test driven")
+
+
+def run_search(root: Path) -> dict:
+    """Time building, reopening and querying the BM25 index of the synthetic archive."""
+    metrics = run_metrics.RunMetrics("search-index")
+    path = root / ".cache" / "search-index-benchmark.bin"
+    records = tip_store.load_records(root)
+
+    with metrics.stage("build", items_in=len(records)):
+        search_index.open_index(root, path, records)
+    with metrics.stage("open"):
+        index = search_index.open_index(root, path, records)
+    with metrics.stage("query", items_in=len(SEARCH_QUERIES)) as stage:
+        stage["hits"] = sum(len(index.search(query)) for query in SEARCH_QUERIES)
+    return metrics.report()
+
+
+def benchmark_size(size: int, args, base_url: str) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix=f"ccd-bench-{size}-"))
+    cwd = os.getcwd()
+    try:
+        started = time.monotonic()
+        build_archive(workdir, size, seed=args.seed)
+        build_seconds = time.monotonic() - started
+
+        os.chdir(workdir)
+        daily = load_script("daily_update", "daily-update.py")
+        newsletter = load_script("weekly_newsletter", "weekly-newsletter.py")
+        point_sources_at(daily, base_url)
+        configure_daily(daily, workdir)
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        try:
+            result = {
+                "size": size,
+                "archive_build_seconds": round(build_seconds, 3),
+                "daily_cold": run_daily(daily, "cold"),
+                "daily_warm": run_daily(daily, "warm"),
+                "newsletter": run_newsletter(newsletter, workdir, base_url),
+                "search": run_search(workdir)
+            }
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+        return result
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+
+def stage_rows(result: dict) -> List[dict]:
+    rows = []
+    for run in ("daily_cold", "daily_warm", "newsletter", "search"):
+        for stage in result.get(run, {}).get("stages", []):
+            items = stage.get("items_in", stage.get("items_out"))
+            rows.append({
+                "key": f"{result['size']}:{run}:{stage['name']}",
+                "run": run,
+                "stage": stage["name"],
+                "seconds": stage["seconds"],
+                "items_per_second": round(items / stage["seconds"], 1) if items and stage["seconds"] else None,
+                "peak_mb": round(stage["peak_bytes"] / 1e6, 2) if "peak_bytes" in stage else None
+            })
+    return rows
+
+
+def print_results(results: List[dict], previous: Optional[dict] = None):
+    before = {}
+    if previous:
+        for result in previous.get("results", []):
+            before.update({row["key"]: row for row in stage_rows(result)})
+
+    for result in results:
+        print(f"\n📦 Archive: {result['size']} tips (generated in {result['archive_build_seconds']:.1f}s)")
+        print(f"   {'run':<11} {'stage':<18} {'seconds':>9} {'items/s':>10} {'peak MB':>8}")
+        for row in stage_rows(result):
+            rate = f"{row['items_per_second']:.0f}" if row["items_per_second"] else "-"
+            peak = f"{row['peak_mb']:.1f}" if row["peak_mb"] is not None else "-"
+            line = f"   {row['run']:<11} {row['stage']:<18} {row['seconds']:>9.3f} {rate:>10} {peak:>8}"
+            old = before.get(row["key"])
+            if old and old["seconds"]:
+                change = (row["seconds"] - old["seconds"]) / old["seconds"] * 100
+                line += f"  ({change:+.0f}% vs previous)"
+            print(line)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the Claude Code Daily automation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="synthetic archive sizes (number of tips)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per fake Gemini call")
+    parser.add_argument("--net-latency", type=float, default=0.05, help="seconds per stub HTTP response")
+    parser.add_argument("--send-delay", type=float, default=0.5,
+                        help="seconds the stub newsletter API takes to deliver a sent issue")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="only run the stub server (feeds + newsletter API) on PORT until interrupted")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic archive")
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false",
+                        help="skip per-stage memory measurement (faster, timing only)")
+    parser.add_argument("--output", default=str(REPO_ROOT / ".cache" / "benchmark.json"),
+                        help="where to write the JSON results")
+    parser.add_argument("--compare", help="previous results JSON to print per-stage changes against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = Path(args.output).resolve()
+    previous = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    print("="*50)
+    print(f"⏱️  Claude Code Daily - Offline Benchmark (sizes: {', '.join(map(str, args.sizes))})")
+    print("="*50)
+
+    StubHandler.send_delay = args.send_delay
+    if args.serve is not None:
+        server = start_stub_server(args.net_latency, args.serve)
+        print(f"🧪 Stub server on http://127.0.0.1:{server.server_port} "
+              f"(e.g. WAITLIST_API_URL=http://127.0.0.1:{server.server_port}), Ctrl-C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    server = start_stub_server(args.net_latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    install_fake_gemini(args.llm_latency)
+
+    results = []
+    try:
+        for size in args.sizes:
+            print(f"🏃 Running {size} tips...")
+            results.append(benchmark_size(size, args, base_url))
+    finally:
+        server.shutdown()
+
+    print_results(results, previous)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "settings": {
+            "llm_latency": args.llm_latency,
+            "net_latency": args.net_latency,
+            "seed": args.seed,
+            "tracemalloc": args.tracemalloc
+        },
+        "results": results
+    }, indent=2))
+    print(f"\n💾 Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
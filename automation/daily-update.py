@@ -25,21 +25,41 @@ Repository Structure:
   └── index.json
 """
 
+import argparse
 import os
 import json
 import hashlib
-import requests
+import math
+import queue
+import random
 import re
+import threading
+import time
+import zlib
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
+from urllib.parse import urlparse
+
+import http_client
+import run_metrics
+import search_index
+import tip_store
 
 # Configuration
 CONFIG = {
     "devto": {
         "tags": ["claude", "claudecode", "anthropic"],
-        "max_age_days": 7
+        "max_age_days": 7,
+        # Claude Code keywords
+        "keywords": ["claude code", "claude-code", "tip", "workflow", "worktree",
+                     "mcp", "subagent", "prompt", "trick", "technique"]
     },
     "hackernews": {
         "queries": ["claude code", "claude-code", "ClaudeCode"],
@@ -49,7 +69,73 @@ CONFIG = {
     "reddit": {
         "subreddits": ["ClaudeAI"],
         "min_score": 10,
-        "max_age_days": 7
+        "max_age_days": 7,
+        # Look for Claude Code related content
+        "keywords": ["tip", "trick", "workflow", "worktree", "context", "mcp", "subagent",
+                     "prompt", "claude code", "hack", "technique", "pattern"],
+        # Negative keywords - filter out non-tips
+        "negative_keywords": [
+            # Complaints and rants
+            "appreciation", "rant", "frustrated", "angry", "disappointed",
+            "broken", "bug report", "anyone else", "does anyone",
+            "i believed", "data is gone", "lost my", "help me",
+            # Questions (not tips)
+            "question about", "how do i", "what is", "why does",
+            "can someone", "is there a way", "looking for",
+            # Off-topic
+            "announcement", "hiring", "job", "newsletter",
+            "guitar", "music", "game", "trading", "crypto",
+            "chatgpt", "openai", "gemini", "llama", "mistral",
+            # App showcases (not Claude Code tips)
+            "built an app", "made an app", "created an app",
+            "my app", "check out my", "just launched",
+            # Seeking help
+            "need help", "please help", "struggling with",
+            "not working", "doesn't work", "stopped working"
+        ]
+    },
+    # Concurrent feed fetching (all RSS/Atom URLs are requested up front)
+    "fetch": {
+        "max_workers": 8,
+        "per_host_limit": 2,
+        "timeout": 30
+    },
+    # Shared HTTP client: retries with jittered backoff / Retry-After and a
+    # per-host token bucket of (requests per second, burst)
+    "http": {
+        "retries": 3,
+        "backoff_base": 1.0,
+        "max_delay": 60.0,
+        "pool_size": 16,
+        "default_rate": (5.0, 5),
+        "host_rates": {
+            "www.reddit.com": (1.0, 2),
+            "api.twitter.com": (0.5, 1)
+        }
+    },
+    # Gemini validation: tips are packed batch_size at a time into one request
+    "gemini": {
+        "model": "gemini-2.0-flash",
+        "batch_size": 10,
+        "min_quality": 7,
+        # Worker pool: concurrent calls, quota limits (free tier defaults) and
+        # how often a throttled batch is requeued before its tips are left
+        # unjudged for the next run
+        "workers": 4,
+        "rpm": 15,
+        "tpm": 1000000,
+        "max_requeues": 5,
+        "backoff_base": 2.0,
+        "max_delay": 60.0          # cap for backoff and the server's retry hint
+    },
+    # On-disk state shared between runs (restored by actions/cache in CI)
+    "cache": {
+        "dir": ".cache",
+        "validation_ttl_days": 30,
+        "validation_max_entries": 5000,
+        "feed_ttl_days": 7,
+        "seen_ttl_days": 90,
+        "seen_max_entries": 20000
     },
     # Twitter disabled - requires $100/month paid API tier
     "twitter": {
@@ -59,6 +145,36 @@ CONFIG = {
         "min_likes": 5,
         "max_age_days": 7
     },
+    # Duplicate detection: exact normalized title, plus MinHash + LSH banding
+    # over character shingles of title + body (2-row bands find pairs down
+    # to ~0.2 similarity, which are then confirmed against threshold)
+    "dedup": {
+        "threshold": 0.35,
+        "shingle_size": 5,
+        "num_perm": 64,
+        "bands": 32
+    },
+    # Local pre-filter: local_tip_score < reject_below is rejected without an
+    # LLM call (and not added to the seen ledger, so a later threshold change
+    # re-scores it); everything else goes to Gemini. There is no local accept
+    # tier: accepted tips need Gemini's title, summary and quality score.
+    "routing": {
+        "reject_below": 0.15
+    },
+    # Streaming pipeline: items flow fetch -> seen check -> validate -> dedup
+    # -> write. Validation takes validate_chunk items at a time, the writer
+    # commits every write_batch accepted tips, and at most buffer_size
+    # fetched items wait between the fetch thread and validation.
+    "pipeline": {
+        "validate_chunk": 40,
+        "write_batch": 25,
+        "buffer_size": 100
+    },
+    # Offline categorizer (naive Bayes over the archive + keyword weights)
+    "categorizer": {
+        "keyword_weight": 0.5,
+        "title_weight": 2
+    },
     "categories": [
         "orchestration",
         "context-management",
@@ -76,6 +192,523 @@ CONFIG = {
 }
 
 
+# Stage timings, counters and cache hit rates for the JSON run report
+METRICS = run_metrics.RunMetrics("daily-update")
+
+RSS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; claude-code-daily/1.0)",
+    "Accept": "application/rss+xml, application/xml, text/xml"
+}
+
+REDDIT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; claude-code-daily/1.0; +https://github.com/mrsarac/claude-code-daily)",
+    "Accept": "application/rss+xml, application/xml, text/xml"
+}
+
+
+def devto_feed_url(tag: str) -> str:
+    return f"https://dev.to/feed/tag/{tag}"
+
+
+def hackernews_feed_url(query: str) -> str:
+    # hnrss.org provides HN as RSS
+    return f"https://hnrss.org/newest?q={query.replace(' ', '+')}"
+
+
+def reddit_feed_url(subreddit_name: str) -> str:
+    # RSS feed is more reliable than JSON API
+    return f"https://www.reddit.com/r/{subreddit_name}/hot/.rss?limit=50"
+
+
+@dataclass(frozen=True)
+class SourceAdapter:
+    """Declarative description of an RSS/Atom source.
+
+    A source only states where its feeds live and which element holds each
+    tip field; fetching, streaming, HTML cleanup, filtering and truncation
+    are shared (see normalize_feed_item). Keyword lists and thresholds stay
+    in CONFIG[name].
+    """
+    name: str                 # CONFIG key and tip["source"]
+    display_name: str         # "Hacker News"
+    icon: str
+    intro: str                # first log line of a fetch
+    feed_label: str           # per-feed log label, formatted with {key}
+    keys: str                 # CONFIG[name][keys] lists the tags/queries/subreddits
+    url: Callable[[str], str]
+    headers: Dict[str, str]
+    item_tag: str
+    # tip field -> element path relative to the item ("path@attr" reads an attribute)
+    fields: Dict[str, str]
+    namespaces: Dict[str, str] = field(default_factory=dict)
+    sorted_by_date: bool = True         # stop reading at the first stale item
+    content_falls_back_to_title: bool = False
+    match_title: bool = True            # positive keywords also checked in the title
+    author_prefix: str = ""             # stripped from author names ("/u/")
+    score_pattern: Optional[str] = None # regex on the cleaned content, group 1 = score
+    min_score_key: Optional[str] = None # CONFIG[name] key holding the minimum score
+
+    def feed_urls(self) -> List[Tuple[str, str]]:
+        return [(key, self.url(key)) for key in CONFIG[self.name][self.keys]]
+
+
+DC_NS = "http://purl.org/dc/elements/1.1/"
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+
+SOURCES = [
+    SourceAdapter(
+        name="devto",
+        display_name="Dev.to",
+        icon="📰",
+        intro="Fetching RSS feeds...",
+        feed_label="Dev.to #{key}",
+        keys="tags",
+        url=devto_feed_url,
+        headers=RSS_HEADERS,
+        item_tag="item",
+        fields={
+            "title": "title",
+            "content": "description",
+            "url": "link",
+            "guid": "guid",
+            "author": f"{{{DC_NS}}}creator",
+            "published": "pubDate"
+        }
+    ),
+    SourceAdapter(
+        name="hackernews",
+        display_name="Hacker News",
+        icon="🔶",
+        intro="Fetching RSS feeds...",
+        feed_label="HN '{key}'",
+        keys="queries",
+        url=hackernews_feed_url,
+        headers=RSS_HEADERS,
+        item_tag="item",
+        fields={
+            "title": "title",
+            "content": "description",
+            "url": "link",
+            "guid": "guid",
+            "author": f"{{{DC_NS}}}creator",
+            "published": "pubDate",
+            "comments_url": "comments"
+        },
+        score_pattern=r'Points: (\d+)',
+        min_score_key="min_points"
+    ),
+    SourceAdapter(
+        name="reddit",
+        display_name="Reddit",
+        icon="🤖",
+        intro="Using RSS feed (no auth required)...",
+        feed_label="Reddit r/{key}",
+        keys="subreddits",
+        url=reddit_feed_url,
+        headers=REDDIT_HEADERS,
+        item_tag="{http://www.w3.org/2005/Atom}entry",
+        fields={
+            "title": "atom:title",
+            "content": "atom:content",
+            "url": "atom:link@href",
+            "guid": "atom:id",
+            "author": "atom:author/atom:name",
+            "published": "atom:published",
+            "updated": "atom:updated"
+        },
+        namespaces=ATOM_NS,
+        # The hot listing is not sorted by date
+        sorted_by_date=False,
+        content_falls_back_to_title=True,
+        match_title=False,
+        author_prefix="/u/"
+    ),
+]
+
+SOURCES_BY_NAME = {source.name: source for source in SOURCES}
+
+
+def get_feed_jobs() -> List[Tuple[str, dict, object]]:
+    """List every (url, headers, parser) the RSS fetchers will request, in order."""
+    return [
+        (url, source.headers, partial(parse_source_feed, source))
+        for source in SOURCES
+        for _, url in source.feed_urls()
+    ]
+
+
+_feed_cache = None
+
+
+def get_feed_cache() -> dict:
+    """Per-URL validators and parsed items from earlier runs (loaded once)."""
+    global _feed_cache
+    if _feed_cache is None:
+        path = Path(CONFIG["cache"]["dir"]) / "feed-cache.json"
+        cache = load_json_state(path, {})
+        cutoff = (datetime.now() - timedelta(days=CONFIG["cache"]["feed_ttl_days"])).isoformat()
+        _feed_cache = {url: entry for url, entry in cache.items() if entry.get("stored_at", "") >= cutoff}
+    return _feed_cache
+
+
+def save_feed_cache():
+    if _feed_cache is not None:
+        tip_store.write_json_atomic(Path(CONFIG["cache"]["dir"]) / "feed-cache.json", _feed_cache, optional=True)
+
+
+def conditional_headers(url: str, headers: dict) -> dict:
+    """Add If-None-Match / If-Modified-Since when we hold a cached copy of url."""
+    entry = get_feed_cache().get(url)
+    if not entry:
+        return headers
+    headers = dict(headers)
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def feed_cutoff(source: str) -> datetime:
+    """Oldest publication time still accepted for a source (max_age_days)."""
+    return datetime.now(timezone.utc) - timedelta(days=CONFIG[source]["max_age_days"])
+
+
+def parse_feed_date(text: Optional[str]) -> Optional[datetime]:
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date into an aware datetime."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def iter_feed_items(stream, tag: str):
+    """Stream a feed with iterparse, yielding each complete <tag> element.
+
+    Yielded elements are cleared and detached from their parent afterwards,
+    so memory stays flat however long the feed is. Stop iterating to stop
+    reading from the network.
+    """
+    parents = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag == tag:
+            yield elem
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def read_feed(url: str, headers: dict, parse) -> Tuple[int, list, int]:
+    """Fetch and stream-parse one feed, reusing cached items on 304 Not Modified.
+
+    parse(stream) must return (tips, post_count). Returns
+    (status_code, tips, post_count); tips is empty for other statuses.
+    """
+    response = http_client.get(url, headers=conditional_headers(url, headers),
+                               timeout=CONFIG["fetch"]["timeout"], stream=True)
+    cache = get_feed_cache()
+
+    try:
+        if response.status_code == 304 and url in cache:
+            entry = cache[url]
+            entry["stored_at"] = datetime.now().isoformat()
+            # Items may have aged past max_age_days since they were cached
+            tips = [
+                dict(tip) for tip in entry["items"]
+                if not tip.get("published")
+                or datetime.fromisoformat(tip["published"]) >= feed_cutoff(tip["source"])
+            ]
+            METRICS.cache("feed", hits=1)
+            return 304, tips, entry.get("post_count", 0)
+
+        if response.status_code != 200:
+            return response.status_code, [], 0
+
+        response.raw.decode_content = True
+        tips, post_count = parse(response.raw)
+        METRICS.cache("feed", misses=1)
+        METRICS.count("bytes_downloaded", response.raw.tell())
+    finally:
+        response.close()
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        cache[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "items": [dict(tip) for tip in tips],
+            "post_count": post_count,
+            "stored_at": datetime.now().isoformat()
+        }
+    else:
+        cache.pop(url, None)
+    return 200, tips, post_count
+
+
+def fetch_feeds_concurrently(jobs: List[Tuple[str, dict, object]]) -> Dict[str, Future]:
+    """Start fetching and parsing all feeds at once under a global and per-host cap.
+
+    Returns immediately with a mapping of URL -> Future of the read_feed()
+    result (or of the exception raised while reading it), so the pipeline
+    can work on the first feed while the others are still downloading. The
+    fetchers still walk their tags/queries in the usual order, so the
+    merged tip list is identical to a sequential run.
+    """
+    settings = CONFIG["fetch"]
+    host_slots = {}
+    for url, _, _ in jobs:
+        host = urlparse(url).netloc
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(settings["per_host_limit"])
+
+    def fetch(job):
+        url, headers, parse = job
+        with host_slots[urlparse(url).netloc]:
+            try:
+                return read_feed(url, headers, parse)
+            except Exception as e:
+                return e
+
+    started = time.monotonic()
+    remaining = [len(jobs)]
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                print(f"⚡ Fetched {len(jobs)} feeds concurrently in {time.monotonic() - started:.1f}s")
+
+    pool = ThreadPoolExecutor(max_workers=settings["max_workers"])
+    futures = {}
+    for job in jobs:
+        futures[job[0]] = pool.submit(fetch, job)
+        futures[job[0]].add_done_callback(done)
+    pool.shutdown(wait=False)
+    return futures
+
+
+def get_feed(url: str, headers: dict, parse, prefetched: Optional[dict] = None) -> Tuple[int, list, int]:
+    """Return the prefetched read_feed() result for url (waiting for it if
+    it is still downloading), or read it directly."""
+    if prefetched is not None and url in prefetched:
+        result = prefetched[url].result()
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return read_feed(url, headers, parse)
+
+
+def load_json_state(path: Path, default):
+    """Load a JSON state file, falling back to default if missing or corrupt."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def validation_cache_key(tip: dict) -> str:
+    """Stable hash of the normalized content the validator actually sees."""
+    text = tip.get("content", "")[:500] or tip.get("title", "")
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()[:20]
+
+
+def load_validation_cache() -> dict:
+    """Load cached validator verdicts, dropping entries older than the TTL."""
+    path = Path(CONFIG["cache"]["dir"]) / "validation-cache.json"
+    cache = load_json_state(path, {})
+    cutoff = (datetime.now() - timedelta(days=CONFIG["cache"]["validation_ttl_days"])).isoformat()
+    return {k: v for k, v in cache.items() if v.get("cached_at", "") >= cutoff}
+
+
+def save_validation_cache(cache: dict):
+    """Persist the verdict cache, keeping only the newest entries."""
+    max_entries = CONFIG["cache"]["validation_max_entries"]
+    if len(cache) > max_entries:
+        newest = sorted(cache.items(), key=lambda kv: kv[1].get("cached_at", ""), reverse=True)
+        cache = dict(newest[:max_entries])
+    tip_store.write_json_atomic(Path(CONFIG["cache"]["dir"]) / "validation-cache.json", cache, optional=True)
+
+
+def normalize_source_url(url: str) -> str:
+    """Canonical form of a source URL: no fragment, tracking params or trailing slash."""
+    parsed = urlparse(url.strip())
+    query = "&".join(
+        part for part in parsed.query.split("&")
+        if part and not part.lower().startswith("utm_")
+    )
+    path = parsed.path.rstrip("/")
+    normalized = f"{parsed.netloc.lower()}{path}"
+    return f"{normalized}?{query}" if query else normalized
+
+
+def seen_keys(tip: dict) -> List[str]:
+    """Ledger keys (short hashes) for a fetched item's URL and GUID."""
+    keys = []
+    if tip.get("url"):
+        keys.append("url:" + normalize_source_url(tip["url"]))
+    if tip.get("guid"):
+        keys.append("guid:" + tip["guid"].strip())
+    return [hashlib.sha1(k.encode()).hexdigest()[:16] for k in keys]
+
+
+def load_seen_ledger() -> dict:
+    """Load the processed-item ledger, expiring entries past the TTL."""
+    ledger = load_json_state(Path(CONFIG["cache"]["dir"]) / "seen-items.json", {})
+    cutoff = (datetime.now() - timedelta(days=CONFIG["cache"]["seen_ttl_days"])).strftime("%Y-%m-%d")
+    return {key: day for key, day in ledger.items() if day >= cutoff}
+
+
+def save_seen_ledger(ledger: dict):
+    """Compact and persist the ledger, keeping the most recently seen entries."""
+    max_entries = CONFIG["cache"]["seen_max_entries"]
+    if len(ledger) > max_entries:
+        newest = sorted(ledger.items(), key=lambda kv: kv[1], reverse=True)
+        ledger = dict(newest[:max_entries])
+    tip_store.write_json_atomic(Path(CONFIG["cache"]["dir"]) / "seen-items.json", ledger)
+
+
+def mark_seen(ledger: dict, tips: list):
+    today = datetime.now().strftime("%Y-%m-%d")
+    for tip in tips:
+        for key in seen_keys(tip):
+            ledger[key] = today
+
+
+def checkpoint_key(tip: dict) -> str:
+    """Stable identity of a fetched item across a crash and a resumed run."""
+    keys = seen_keys(tip)
+    return keys[0] if keys else validation_cache_key(tip)
+
+
+class RunCheckpoint:
+    """Progress of the current daily run, saved to .cache/checkpoint.json.
+
+    Records the first tip number of the run, the fetched items once the
+    fetch stage completes, the outcome of every judged item (accepted tips
+    with their category, title and summary, or a rejection) and the tip
+    numbers assigned to each write group, both before and after it is
+    committed. `--resume` reads it back so a run that died late is finished
+    without refetching or re-validating.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, state: Optional[dict] = None):
+        self.path = path
+        self.lock = threading.Lock()
+        state = state or {}
+        self.started_at = state.get("started_at", datetime.now().isoformat())
+        self.first_number = state.get("first_number")
+        self.fetched = state.get("fetched")
+        self.outcomes = state.get("outcomes", {})
+        self.numbers = state.get("numbers", {})
+        self.written = set(state.get("written", []))
+        self.completed = state.get("completed", False)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["RunCheckpoint"]:
+        """The checkpoint of an interrupted run, or None if there is nothing to resume."""
+        state = load_json_state(path, None)
+        if not state or state.get("version") != cls.VERSION or state.get("completed"):
+            return None
+        return cls(path, state)
+
+    def save(self):
+        with self.lock:
+            tip_store.write_json_atomic(self.path, {
+                "version": self.VERSION,
+                "started_at": self.started_at,
+                "first_number": self.first_number,
+                "fetched": self.fetched,
+                "outcomes": self.outcomes,
+                "numbers": self.numbers,
+                "written": sorted(self.written),
+                "completed": self.completed
+            })
+
+    def record_fetched(self, tips: list):
+        self.fetched = [dict(tip) for tip in tips]
+        self.save()
+
+    def record_outcomes(self, tips: list, accepted: list):
+        accepted_ids = {id(tip) for tip in accepted}
+        with self.lock:
+            for tip in tips:
+                if id(tip) in accepted_ids:
+                    self.outcomes[checkpoint_key(tip)] = {"accepted": True, "tip": dict(tip)}
+                elif tip.get("judged"):
+                    self.outcomes[checkpoint_key(tip)] = {"accepted": False, "local": bool(tip.get("rejected_locally"))}
+        self.save()
+
+    def record_numbers(self, numbered_tips: List[Tuple[int, dict]]):
+        with self.lock:
+            for number, tip in numbered_tips:
+                self.numbers[checkpoint_key(tip)] = {
+                    "number": number,
+                    "title": tip.get("ai_title", tip.get("title", "New Tip")).strip()
+                }
+        self.save()
+
+    def record_written(self, tips: list):
+        with self.lock:
+            self.written.update(checkpoint_key(tip) for tip in tips)
+        self.save()
+
+    def reconcile(self, existing: dict):
+        """Count numbered tips that reached the archive as written.
+
+        Covers a crash between a group's commit and its checkpoint update.
+        """
+        archived = {(record["number"], record["title"]) for record in existing.get("tips", [])}
+        for key, entry in self.numbers.items():
+            if key not in self.written and (entry["number"], entry["title"]) in archived:
+                self.written.add(key)
+
+    def finish(self):
+        self.completed = True
+        self.save()
+
+
+def iter_unseen(tips, ledger: dict, existing: dict):
+    """Yield only items not processed on an earlier run, not already in the
+    archive (matched by their [Original] link) and not repeated across feeds
+    in this run.
+    """
+    archived = {
+        hashlib.sha1(("url:" + normalize_source_url(url)).encode()).hexdigest()[:16]
+        for url in existing.get("urls", set())
+    }
+    in_run = set()
+    skipped = fresh = 0
+    for tip in tips:
+        keys = seen_keys(tip)
+        if any(k in ledger or k in archived or k in in_run for k in keys):
+            skipped += 1
+            continue
+        in_run.update(keys)
+        fresh += 1
+        yield tip
+
+    METRICS.cache("seen_ledger", hits=skipped, misses=fresh)
+    if skipped:
+        print(f"🧾 Seen ledger: Skipped {skipped} already-processed items")
+
+
 def get_existing_tips():
     """Load existing tips to check for duplicates.
 
@@ -84,190 +717,366 @@ def get_existing_tips():
     **Source:** Author Name
     Content...
     ---
+
+    Records come from the shared tip store, which parses each file once and
+    caches the result until the file's mtime or size changes.
     """
     tips_dir = Path("tips/categories")
-    all_tips = {"tips": [], "hashes": set(), "next_number": 51}  # Start after 50 existing
+    all_tips = {"tips": [], "urls": set(), "next_number": 51}  # Start after 50 existing
 
     if not tips_dir.exists():
         print(f"⚠️  Tips directory not found: {tips_dir}")
         return all_tips
 
-    # Scan all category files
-    for category in CONFIG["categories"]:
-        category_file = tips_dir / f"{category}.md"
-        if category_file.exists():
-            content = category_file.read_text()
-            # Find all tip titles using regex: ## N. Title
-            tip_pattern = r'^## (\d+)\. (.+)$'
-            for match in re.finditer(tip_pattern, content, re.MULTILINE):
-                tip_num = int(match.group(1))
-                title = match.group(2).strip()
-                all_tips["tips"].append({
-                    "number": tip_num,
-                    "title": title,
-                    "category": category,
-                    "file": str(category_file)
-                })
-                all_tips["hashes"].add(generate_tip_hash(title))
-                # Track highest tip number
-                if tip_num >= all_tips["next_number"]:
-                    all_tips["next_number"] = tip_num + 1
+    cache_path = Path(CONFIG["cache"]["dir"]) / "tip-store.json"
+    store_stats = {}
+    records = tip_store.load_records(Path("."), CONFIG["categories"], cache_path, store_stats)
+    METRICS.cache("tip_store", hits=store_stats.get("cached", 0), misses=store_stats.get("parsed", 0))
+    for record in records:
+        all_tips["tips"].append(record)
+        # Source links let the seen ledger recognise re-fetched posts
+        if record["url"]:
+            all_tips["urls"].add(record["url"])
+        # Track highest tip number
+        if record["number"] >= all_tips["next_number"]:
+            all_tips["next_number"] = record["number"] + 1
 
     return all_tips
 
 
-def generate_tip_hash(tip_text: str) -> str:
-    """Generate a hash for deduplication."""
-    normalized = tip_text.lower().strip()
-    # Remove common words for better matching
-    for word in ["the", "a", "an", "to", "for", "in", "on", "with"]:
-        normalized = normalized.replace(f" {word} ", " ")
-    return hashlib.md5(normalized.encode()).hexdigest()[:12]
+def similarity_text(title: str, body: str) -> str:
+    """Title plus body with the markdown scaffolding (source, links, rules) removed."""
+    return title + "\n" + tip_store.tip_text(body)
 
 
-def fetch_devto_tips():
-    """
-    Fetch tips from Dev.to using RSS feeds.
+def title_key(title: str) -> str:
+    """Lower-cased title words without punctuation."""
+    return " ".join(tip_store.words(title))
 
-    Dev.to provides free RSS feeds for tags.
+
+class NearDuplicateIndex:
+    """MinHash signatures with LSH banding for sub-linear similarity lookup.
+
+    Documents are shingled into character n-grams of their normalized
+    words, which still overlap when a post is reworded. Each signature is
+    split into `bands` bands; two documents become candidates when any band
+    matches, and candidates are confirmed by their estimated Jaccard
+    similarity. Titles are also kept for an exact (normalized) match.
     """
-    tips = []
-    print("📰 Dev.to: Fetching RSS feeds...")
 
-    for tag in CONFIG["devto"]["tags"]:
-        try:
-            url = f"https://dev.to/feed/tag/{tag}"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (compatible; claude-code-daily/1.0)",
-                "Accept": "application/rss+xml, application/xml, text/xml"
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+    VERSION = 2  # bump when shingling changes, so cached signatures are redone
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, threshold: float = 0.35, num_perm: int = 64, bands: int = 32, shingle_size: int = 5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(1)  # fixed seed: signatures are comparable across runs
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME)) for _ in range(num_perm)]
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._titles = {}
+
+    def shingles(self, text: str) -> set:
+        normalized = " ".join(tip_store.words(text))
+        size = self.shingle_size
+        if len(normalized) <= size:
+            return {normalized} if normalized else set()
+        return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+    def signature(self, text: str) -> tuple:
+        hashes = [zlib.crc32(s.encode()) for s in self.shingles(text)] or [0]
+        prime = self._PRIME
+        return tuple(min((a * h + b) % prime for h in hashes) for a, b in self._perms)
+
+    def _bands(self, signature: tuple):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def add(self, key, text: str = "", title: str = "", signature: Optional[tuple] = None) -> tuple:
+        """Index a document (or its precomputed signature); returns the signature."""
+        signature = tuple(signature) if signature is not None else self.signature(text)
+        self._signatures[key] = signature
+        for band, chunk in self._bands(signature):
+            self._buckets[band].setdefault(chunk, []).append(key)
+        if title_key(title):
+            self._titles.setdefault(title_key(title), key)
+        return signature
+
+    def same_title(self, title: str):
+        """Key of an indexed document with the same normalized title, or None."""
+        return self._titles.get(title_key(title)) if title_key(title) else None
+
+    def query(self, text: str) -> List[Tuple[object, float]]:
+        """Return (key, estimated similarity) for indexed documents above the threshold."""
+        signature = self.signature(text)
+        candidates = set()
+        for band, chunk in self._bands(signature):
+            candidates.update(self._buckets[band].get(chunk, ()))
+
+        matches = []
+        for key in candidates:
+            other = self._signatures[key]
+            similarity = sum(x == y for x, y in zip(signature, other)) / self.num_perm
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda m: m[1], reverse=True)
+
+    def __len__(self):
+        return len(self._signatures)
+
+
+def build_near_duplicate_index(existing: dict) -> NearDuplicateIndex:
+    """Index the title and body of every tip already in the archive.
+
+    Signatures are cached in .cache/near-duplicates.json by tip number and
+    record hash, so only tips added or edited since the last run are read
+    and hashed again.
+    """
+    settings = CONFIG["dedup"]
+    index = NearDuplicateIndex(settings["threshold"], settings["num_perm"], settings["bands"], settings["shingle_size"])
+    path = Path(CONFIG["cache"]["dir"]) / "near-duplicates.json"
+    params = [NearDuplicateIndex.VERSION, settings["num_perm"], settings["shingle_size"]]
+    cache = load_json_state(path, {})
+    cached = cache.get("tips", {}) if cache.get("params") == params else {}
+
+    records = existing.get("tips", [])
+    stale = [record for record in records if cached.get(str(record["number"]), [None])[0] != record["hash"]]
+    # Copies, so body text is not left on the archive records
+    fresh = {
+        tip["number"]: index.signature(similarity_text(tip["title"], tip["body"]))
+        for tip in tip_store.load_bodies([dict(record) for record in stale])
+    }
+    signatures = {}
+    for record in records:
+        number = record["number"]
+        signature = fresh[number] if number in fresh else cached[str(number)][1]
+        signatures[str(number)] = [record["hash"], index.add(number, title=record["title"], signature=signature)]
 
-            if response.status_code == 200:
-                try:
-                    root = ET.fromstring(response.content)
-                    items = root.findall(".//item")
-                    tag_tips = 0
-
-                    for item in items:
-                        title_elem = item.find("title")
-                        desc_elem = item.find("description")
-                        link_elem = item.find("link")
-                        creator_elem = item.find("{http://purl.org/dc/elements/1.1/}creator")
-                        pubdate_elem = item.find("pubDate")
-
-                        if title_elem is not None:
-                            title = title_elem.text or ""
-                            desc = desc_elem.text if desc_elem is not None else ""
-                            link = link_elem.text if link_elem is not None else ""
-                            author = creator_elem.text if creator_elem is not None else "unknown"
-
-                            # Clean HTML
-                            desc = re.sub(r'<[^>]+>', '', desc)
-
-                            # Claude Code keywords
-                            keywords = ["claude code", "claude-code", "tip", "workflow", "worktree",
-                                       "mcp", "subagent", "prompt", "trick", "technique"]
-                            content_lower = (title + " " + desc).lower()
-
-                            if any(kw in content_lower for kw in keywords):
-                                tips.append({
-                                    "title": title[:100],
-                                    "content": desc[:500],
-                                    "source": "devto",
-                                    "author": author,
-                                    "url": link,
-                                    "score": 0
-                                })
-                                tag_tips += 1
-
-                    print(f"📰 Dev.to #{tag}: Found {tag_tips} tips (from {len(items)} posts)")
-
-                except ET.ParseError as e:
-                    print(f"⚠️  Dev.to #{tag}: RSS parse error - {str(e)[:30]}")
+    METRICS.cache("near_duplicates", hits=len(records) - len(stale), misses=len(stale))
+    if stale or len(cached) != len(signatures):
+        tip_store.write_json_atomic(path, {"params": params, "tips": signatures}, optional=True)
+    return index
 
-            else:
-                print(f"⚠️  Dev.to #{tag}: HTTP {response.status_code}")
 
-        except Exception as e:
-            print(f"⚠️  Dev.to #{tag}: Error - {str(e)[:50]}")
+HTML_TAG = re.compile(r'<[^>]+>')
 
-    print(f"📰 Dev.to: Total {len(tips)} tips found")
-    return tips
 
+class KeywordMatcher:
+    """Every keyword list in CONFIG compiled into one overlapping-match regex.
 
-def fetch_hackernews_tips():
+    Keywords are arranged as a trie and emitted as a single regex inside a
+    lookahead, so one scan reports a match at every position where some
+    keyword starts (longest first). Shorter keywords starting at the same
+    position are prefixes of that match and are expanded from a table, so
+    every occurrence of every keyword is found. Each keyword carries the
+    labels of the lists it belongs to, e.g. "reddit:negative_keywords" or
+    "category:tooling".
     """
-    Fetch tips from Hacker News using hnrss.org.
 
-    hnrss.org provides free RSS feeds for HN searches.
+    def __init__(self, groups: Dict[str, List[str]]):
+        self._labels = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                self._labels.setdefault(keyword.lower(), set()).add(label)
+
+        trie = {}
+        for keyword in self._labels:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._pattern = re.compile("(?=(" + self._trie_pattern(trie) + "))") if trie else None
+        self._prefixes = {
+            keyword: [other for other in self._labels if keyword.startswith(other)]
+            for keyword in self._labels
+        }
+
+    @classmethod
+    def _trie_pattern(cls, node: dict) -> str:
+        branches = [re.escape(ch) + cls._trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: prefer the longer keyword when this node also ends one
+        return f"(?:{body})?" if "" in node else body
+
+    def scan(self, text: str) -> List[Tuple[int, str]]:
+        """All (position, keyword) occurrences in an already-lowercased text."""
+        if self._pattern is None:
+            return []
+        hits = []
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            hits.extend((start, keyword) for keyword in self._prefixes[match.group(1)])
+        return hits
+
+    def label_counts(self, hits: List[Tuple[int, str]]) -> Dict[str, int]:
+        """Number of hits per label."""
+        counts = {}
+        for _, keyword in hits:
+            for label in self._labels[keyword]:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
+
+    def labels(self, hits: List[Tuple[int, str]], start: int = 0, end: Optional[int] = None) -> set:
+        """Labels of the hits lying entirely inside text[start:end]."""
+        found = set()
+        for pos, keyword in hits:
+            if pos >= start and (end is None or pos + len(keyword) <= end):
+                found.update(self._labels[keyword])
+        return found
+
+
+@lru_cache(maxsize=None)
+def keyword_matcher() -> KeywordMatcher:
+    """The shared matcher, built once from CONFIG's source and category keywords."""
+    groups = {}
+    for source in SOURCES:
+        for key in ("keywords", "negative_keywords"):
+            if CONFIG[source.name].get(key):
+                groups[f"{source.name}:{key}"] = CONFIG[source.name][key]
+    for category, keywords in CONFIG["category_keywords"].items():
+        groups[f"category:{category}"] = keywords
+    return KeywordMatcher(groups)
+
+
+@lru_cache(maxsize=None)
+def source_filters(name: str) -> dict:
+    """Precompiled score matcher and keyword labels for a source."""
+    source = SOURCES_BY_NAME[name]
+    settings = CONFIG[name]
+    return {
+        "positive": f"{name}:keywords" if settings.get("keywords") else None,
+        "negative": f"{name}:negative_keywords" if settings.get("negative_keywords") else None,
+        "score": re.compile(source.score_pattern) if source.score_pattern else None,
+        "min_score": settings.get(source.min_score_key, 0) if source.min_score_key else 0
+    }
+
+
+def item_field(item, path: str, namespaces: Dict[str, str]) -> Optional[str]:
+    """Text (or attribute, for "path@attr") of a child element, None if absent."""
+    path, _, attr = path.partition("@")
+    elem = item.find(path, namespaces)
+    if elem is None:
+        return None
+    return elem.get(attr, "") if attr else (elem.text or "")
+
+
+def normalize_feed_item(source: SourceAdapter, item, published: Optional[datetime]) -> Optional[dict]:
+    """Shared per-item pipeline: extract, clean HTML, filter, truncate."""
+    fields = {name: item_field(item, path, source.namespaces) for name, path in source.fields.items()}
+    if fields["title"] is None:
+        return None
+
+    title = fields["title"]
+    content = fields.get("content")
+    if content is None:
+        content = title if source.content_falls_back_to_title else ""
+    content = HTML_TAG.sub('', content)
+
+    # One scan of "title content" finds every positive and negative keyword
+    filters = source_filters(source.name)
+    matcher = keyword_matcher()
+    hits = matcher.scan(title.lower() + " " + content.lower())
+    content_start = len(title) + 1
+
+    # Must have positive keywords AND no negative keywords
+    if filters["positive"]:
+        scope_start = 0 if source.match_title else content_start
+        if filters["positive"] not in matcher.labels(hits, scope_start):
+            return None
+    if filters["negative"]:
+        if (filters["negative"] in matcher.labels(hits, 0, len(title))
+                or filters["negative"] in matcher.labels(hits, content_start, content_start + 200)):
+            return None
+
+    score = 0
+    if filters["score"]:
+        score_match = filters["score"].search(content)
+        score = int(score_match.group(1)) if score_match else 0
+        if score < filters["min_score"]:
+            return None
+
+    author = fields.get("author") or "unknown"
+    if source.author_prefix:
+        author = author.replace(source.author_prefix, "")
+
+    tip = {
+        "title": title[:100],
+        "content": content[:500],
+        "source": source.name,
+        "author": author,
+        "url": fields.get("url") or "",
+        "guid": fields.get("guid") or "",
+        "published": published.isoformat() if published else "",
+        "score": score
+    }
+    if "comments_url" in fields:
+        tip["comments_url"] = fields["comments_url"] or ""
+    return tip
+
+
+def parse_source_feed(source: SourceAdapter, stream) -> Tuple[list, int]:
+    """Stream one feed of a source into tips, enforcing max_age_days.
+
+    Sorted feeds stop at the first item older than the cutoff; unsorted
+    ones only skip stale items.
     """
+    cutoff = feed_cutoff(source.name)
     tips = []
-    print("🔶 Hacker News: Fetching RSS feeds...")
+    post_count = 0
 
-    for query in CONFIG["hackernews"]["queries"]:
-        try:
-            # hnrss.org provides HN as RSS
-            url = f"https://hnrss.org/newest?q={query.replace(' ', '+')}"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (compatible; claude-code-daily/1.0)",
-                "Accept": "application/rss+xml, application/xml, text/xml"
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+    for item in iter_feed_items(stream, source.item_tag):
+        published = parse_feed_date(
+            item_field(item, source.fields["published"], source.namespaces)
+            or (item_field(item, source.fields["updated"], source.namespaces) if "updated" in source.fields else None)
+        )
+        stale = published is not None and published < cutoff
+        if stale and source.sorted_by_date:
+            break
+        post_count += 1
+        if stale:
+            continue
 
-            if response.status_code == 200:
-                try:
-                    root = ET.fromstring(response.content)
-                    items = root.findall(".//item")
-                    query_tips = 0
-
-                    for item in items:
-                        title_elem = item.find("title")
-                        desc_elem = item.find("description")
-                        link_elem = item.find("link")
-                        creator_elem = item.find("{http://purl.org/dc/elements/1.1/}creator")
-                        comments_elem = item.find("comments")
-
-                        if title_elem is not None:
-                            title = title_elem.text or ""
-                            desc = desc_elem.text if desc_elem is not None else ""
-                            link = link_elem.text if link_elem is not None else ""
-                            author = creator_elem.text if creator_elem is not None else "unknown"
-                            comments_url = comments_elem.text if comments_elem is not None else ""
-
-                            # Clean HTML
-                            desc = re.sub(r'<[^>]+>', '', desc)
-
-                            # Extract points from description
-                            points_match = re.search(r'Points: (\d+)', desc)
-                            points = int(points_match.group(1)) if points_match else 0
-
-                            # Filter by minimum points
-                            if points >= CONFIG["hackernews"]["min_points"]:
-                                tips.append({
-                                    "title": title[:100],
-                                    "content": desc[:500],
-                                    "source": "hackernews",
-                                    "author": author,
-                                    "url": link,
-                                    "score": points,
-                                    "comments_url": comments_url
-                                })
-                                query_tips += 1
-
-                    print(f"🔶 HN '{query}': Found {query_tips} tips (from {len(items)} posts)")
-
-                except ET.ParseError as e:
-                    print(f"⚠️  HN '{query}': RSS parse error - {str(e)[:30]}")
+        tip = normalize_feed_item(source, item, published)
+        if tip:
+            tips.append(tip)
+
+    return tips, post_count
 
+
+def iter_source_tips(source: SourceAdapter, prefetched: Optional[dict] = None):
+    """Yield the tips of every feed of a source, feed by feed, and log counts."""
+    total = 0
+    print(f"{source.icon} {source.display_name}: {source.intro}")
+
+    for key, url in source.feed_urls():
+        label = source.feed_label.format(key=key)
+        try:
+            status, feed_tips, post_count = get_feed(url, source.headers, partial(parse_source_feed, source), prefetched)
+
+            if status in (200, 304):
+                total += len(feed_tips)
+                yield from feed_tips
+                cached = " (not modified)" if status == 304 else ""
+                print(f"{source.icon} {label}: Found {len(feed_tips)} tips (from {post_count} posts){cached}")
+            elif status == 429:
+                print(f"⚠️  {label}: Rate limited after retries, skipping...")
             else:
-                print(f"⚠️  HN '{query}': HTTP {response.status_code}")
+                print(f"⚠️  {label}: HTTP {status}")
 
+        except ET.ParseError as e:
+            print(f"⚠️  {label}: RSS parse error - {str(e)[:30]}")
         except Exception as e:
-            print(f"⚠️  HN '{query}': Error - {str(e)[:50]}")
+            print(f"⚠️  {label}: Error - {str(e)[:50]}")
 
-    print(f"🔶 Hacker News: Total {len(tips)} tips found")
-    return tips
+    print(f"{source.icon} {source.display_name}: Total {total} tips found")
 
 
 def fetch_twitter_tips():
@@ -302,7 +1111,7 @@ def fetch_twitter_tips():
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = http_client.get(url, headers=headers, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -328,7 +1137,7 @@ def fetch_twitter_tips():
                 print(f"🐦 Twitter #{hashtag}: Found {len(tweets)} tweets, {len([t for t in tips if hashtag.lower() in t.get('content', '').lower()])} quality tips")
 
             elif response.status_code == 429:
-                print(f"⚠️  Twitter: Rate limited, skipping #{hashtag}...")
+                print(f"⚠️  Twitter: Rate limited after retries, skipping #{hashtag}...")
             elif response.status_code == 403:
                 print(f"⚠️  Twitter #{hashtag}: Access denied (Free tier doesn't include search API)")
                 break  # No point trying other hashtags
@@ -342,122 +1151,115 @@ def fetch_twitter_tips():
     return tips
 
 
-def fetch_reddit_tips():
-    """
-    Fetch tips from Reddit using RSS feed (more reliable than JSON API).
+class TipCategorizer:
+    """Offline category scorer: multinomial naive Bayes plus keyword weights.
 
-    RSS feeds don't require authentication and are less likely to be blocked.
+    Trained on the titles (weighted) and bodies of the archived tips. Every
+    category is scored at once from the term frequencies of a text; hits
+    from CONFIG["category_keywords"] add a fixed weight per hit. Priors are
+    uniform so the archive's uneven category sizes don't snowball.
+    classify() returns (category, confidence), where confidence is the
+    posterior of the best category after length normalization.
     """
-    tips = []
 
-    print("🤖 Reddit: Using RSS feed (no auth required)...")
+    def __init__(self, categories: List[str], keyword_weight: float = 1.0,
+                 title_weight: int = 2, alpha: float = 1.0):
+        self.categories = list(categories)
+        self.keyword_weight = keyword_weight
+        self.title_weight = title_weight
+        self.alpha = alpha
+        self._counts = {c: {} for c in self.categories}
+        self._totals = {c: 0 for c in self.categories}
+        self._log_probs = None
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        return tip_store.tokenize(text)
+
+    def train(self, category: str, title: str, body: str):
+        if category not in self._counts:
+            return
+        counts = self._counts[category]
+        for token in self.tokens(title) * self.title_weight + self.tokens(body):
+            counts[token] = counts.get(token, 0) + 1
+            self._totals[category] += 1
+        self._log_probs = None
+
+    def _model(self) -> Dict[str, Dict[str, float]]:
+        if self._log_probs is None:
+            vocab = set()
+            for counts in self._counts.values():
+                vocab.update(counts)
+            size = max(1, len(vocab))
+            self._log_probs = {}
+            for c in self.categories:
+                denom = self._totals[c] + self.alpha * size
+                self._log_probs[c] = {
+                    t: math.log((self._counts[c].get(t, 0) + self.alpha) / denom) for t in vocab
+                }
+        return self._log_probs
+
+    def scores(self, title: str, body: str) -> Dict[str, float]:
+        """Length-normalized log score per category (higher is better)."""
+        model = self._model()
+        tokens = [t for t in self.tokens(title) * self.title_weight + self.tokens(body) if t in model[self.categories[0]]]
+        norm = math.sqrt(len(tokens)) if tokens else 1.0
+
+        matcher = keyword_matcher()
+        hit_counts = matcher.label_counts(matcher.scan((title + " " + body).lower()))
+
+        return {
+            c: sum(model[c][t] for t in tokens) / norm
+            + self.keyword_weight * hit_counts.get(f"category:{c}", 0)
+            for c in self.categories
+        }
 
-    for subreddit_name in CONFIG["reddit"]["subreddits"]:
-        try:
-            # RSS feed is more reliable than JSON API
-            url = f"https://www.reddit.com/r/{subreddit_name}/hot/.rss?limit=50"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (compatible; claude-code-daily/1.0; +https://github.com/mrsarac/claude-code-daily)",
-                "Accept": "application/rss+xml, application/xml, text/xml"
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+    def classify(self, title: str, body: str) -> Tuple[str, float]:
+        scores = self.scores(title, body)
+        top = max(scores.values())
+        weights = {c: math.exp(s - top) for c, s in scores.items()}
+        if len(set(scores.values())) == 1:
+            return "workflow", 0.0  # no evidence at all
+        best = max(self.categories, key=lambda c: weights[c])
+        return best, weights[best] / sum(weights.values())
 
-            if response.status_code == 200:
-                # Parse RSS/Atom feed
-                try:
-                    root = ET.fromstring(response.content)
-                    # Handle Atom namespace
-                    ns = {"atom": "http://www.w3.org/2005/Atom"}
-
-                    entries = root.findall(".//atom:entry", ns)
-                    subreddit_tips = 0
-
-                    for entry in entries:
-                        title_elem = entry.find("atom:title", ns)
-                        content_elem = entry.find("atom:content", ns)
-                        link_elem = entry.find("atom:link", ns)
-                        author_elem = entry.find("atom:author/atom:name", ns)
-
-                        if title_elem is not None:
-                            title = title_elem.text or ""
-                            content = content_elem.text if content_elem is not None else title
-                            link = link_elem.get("href", "") if link_elem is not None else ""
-                            author = author_elem.text if author_elem is not None else "unknown"
-
-                            # Clean HTML from content
-                            content = re.sub(r'<[^>]+>', '', content)
-
-                            # Look for Claude Code related content
-                            keywords = ["tip", "trick", "workflow", "worktree", "context", "mcp", "subagent", "prompt", "claude code", "hack", "technique", "pattern"]
-                            # Negative keywords - filter out non-tips
-                            negative_keywords = [
-                                # Complaints and rants
-                                "appreciation", "rant", "frustrated", "angry", "disappointed",
-                                "broken", "bug report", "anyone else", "does anyone",
-                                "i believed", "data is gone", "lost my", "help me",
-                                # Questions (not tips)
-                                "question about", "how do i", "what is", "why does",
-                                "can someone", "is there a way", "looking for",
-                                # Off-topic
-                                "announcement", "hiring", "job", "newsletter",
-                                "guitar", "music", "game", "trading", "crypto",
-                                "chatgpt", "openai", "gemini", "llama", "mistral",
-                                # App showcases (not Claude Code tips)
-                                "built an app", "made an app", "created an app",
-                                "my app", "check out my", "just launched",
-                                # Seeking help
-                                "need help", "please help", "struggling with",
-                                "not working", "doesn't work", "stopped working"
-                            ]
-                            content_lower = content.lower()
-                            title_lower = title.lower()
-
-                            # Must have positive keywords AND no negative keywords
-                            has_positive = any(kw in content_lower for kw in keywords)
-                            has_negative = any(nk in title_lower or nk in content_lower[:200] for nk in negative_keywords)
-
-                            if has_positive and not has_negative:
-                                tips.append({
-                                    "title": title[:100],
-                                    "content": content[:500],
-                                    "source": "reddit",
-                                    "author": author.replace("/u/", ""),
-                                    "url": link,
-                                    "score": 0  # RSS doesn't include score
-                                })
-                                subreddit_tips += 1
-
-                    print(f"🤖 Reddit r/{subreddit_name}: Found {subreddit_tips} tips (from {len(entries)} posts)")
-
-                except ET.ParseError as e:
-                    print(f"⚠️  Reddit r/{subreddit_name}: RSS parse error - {str(e)[:30]}")
 
-            elif response.status_code == 429:
-                print(f"⚠️  Reddit r/{subreddit_name}: Rate limited, skipping...")
-            else:
-                print(f"⚠️  Reddit r/{subreddit_name}: HTTP {response.status_code}")
+_training_cutoff: Optional[int] = None
 
-        except Exception as e:
-            print(f"⚠️  Reddit r/{subreddit_name}: Error - {str(e)[:50]}")
 
-    print(f"🤖 Reddit: Total {len(tips)} tips found")
-    return tips
+@lru_cache(maxsize=None)
+def tip_categorizer() -> TipCategorizer:
+    """Categorizer trained once per run on the archived tips.
+
+    Tips numbered from _training_cutoff on were added by the current run
+    (before a crash, when resuming) and are left out, so a resumed run
+    judges the remaining items with the same model.
+    """
+    settings = CONFIG["categorizer"]
+    categorizer = TipCategorizer(CONFIG["categories"], settings["keyword_weight"], settings["title_weight"])
+    records = [
+        record for record in get_existing_tips()["tips"]
+        if _training_cutoff is None or record["number"] < _training_cutoff
+    ]
+    for record in tip_store.load_bodies(records):
+        categorizer.train(record["category"], record["title"], similarity_text("", record["body"]))
+    return categorizer
 
 
 def categorize_by_keywords(tips: list) -> list:
-    """Fallback categorization using keywords when Gemini is unavailable."""
+    """Fallback categorization when Gemini is unavailable.
+
+    Every category is scored with the archive-trained TipCategorizer
+    (term frequencies plus keyword hits), instead of taking the first
+    category with any keyword match.
+    """
+    categorizer = tip_categorizer()
     categorized = []
     for tip in tips:
-        content = (tip.get("content", "") + " " + tip.get("title", "")).lower()
-        category = "workflow"  # default
-
-        # Check each category's keywords
-        for cat, keywords in CONFIG["category_keywords"].items():
-            if any(kw in content for kw in keywords):
-                category = cat
-                break
+        category, confidence = categorizer.classify(tip.get("title", ""), tip.get("content", ""))
 
         tip["category"] = category
+        tip["category_confidence"] = round(confidence, 3)
         tip["ai_title"] = tip.get("title", "Tip")[:60]
         tip["summary"] = tip.get("content", "")[:200]
         categorized.append(tip)
@@ -466,34 +1268,7 @@ def categorize_by_keywords(tips: list) -> list:
     return categorized
 
 
-def validate_and_categorize(tips: list) -> list:
-    """
-    Use Gemini AI to validate tips and assign categories.
-
-    Requires GEMINI_API_KEY environment variable.
-    """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not tips:
-        return tips
-
-    if not api_key:
-        print("⚠️  Gemini: No API key found, using keyword categorization...")
-        return categorize_by_keywords(tips)
-
-    try:
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.0-flash')
-
-        validated_tips = []
-
-        for tip in tips:
-            prompt = f"""You are a STRICT content validator for Claude Code tips. Be very selective.
-
-Content: {tip.get('content', '')[:500]}
-
-VALID Claude Code tips MUST:
+VALIDATION_CRITERIA = """VALID Claude Code tips MUST:
 - Be about Claude Code CLI (the Anthropic terminal tool) or Claude Code workflows
 - Contain actionable techniques, tricks, or patterns for using Claude Code
 - Include specific commands, configurations, or methodologies
@@ -506,70 +1281,507 @@ REJECT if content is:
 - A general discussion without actionable advice
 - About apps/tools built WITH Claude (not ABOUT Claude Code)
 
-Tasks:
+Tasks (for each item):
 1. Is this a VALID Claude Code tip? (true ONLY if it's actionable advice about Claude Code CLI)
 2. Rate quality 1-10 (be strict: 7+ only for genuinely useful tips)
 3. Assign category: orchestration, context-management, workflow, subagents, or tooling
 4. Write a concise title (max 60 chars)
-5. Write a one-paragraph summary of the actionable tip
+5. Write a one-paragraph summary of the actionable tip"""
 
-Respond ONLY with valid JSON:
-{{"is_valid": true/false, "quality": 1-10, "category": "string", "title": "string", "summary": "string"}}"""
 
-            try:
-                response = model.generate_content(prompt)
-                result_text = response.text.strip()
-
-                # Clean up response
-                if result_text.startswith("```"):
-                    result_text = result_text.split("```")[1]
-                    if result_text.startswith("json"):
-                        result_text = result_text[4:]
-
-                result = json.loads(result_text)
-
-                # STRICT: Must be valid AND quality >= 7
-                if result.get("is_valid") and result.get("quality", 0) >= 7:
-                    tip["category"] = result.get("category", "workflow")
-                    tip["ai_title"] = result.get("title", tip["title"])
-                    tip["summary"] = result.get("summary", "")
-                    tip["quality"] = result.get("quality", 5)
-                    validated_tips.append(tip)
-                else:
-                    # Log rejected tips for debugging
-                    print(f"   ❌ Rejected: {tip.get('title', 'Unknown')[:40]}... (valid={result.get('is_valid')}, quality={result.get('quality')})")
+def build_validation_prompt(batch: List[Tuple[str, dict]]) -> str:
+    """Pack several tips into one validator prompt, each tagged with its id."""
+    items = "\n\n".join(
+        f"[{tip_id}]\nContent: {tip.get('content', '')[:500]}" for tip_id, tip in batch
+    )
+    return f"""You are a STRICT content validator for Claude Code tips. Be very selective.
 
-            except Exception as e:
-                print(f"⚠️  Gemini validation error: {str(e)[:30]}")
-                # Do NOT add tips that fail validation - skip them
+Judge each of the {len(batch)} items below independently. Every item starts with its id in square brackets.
+
+{items}
+
+{VALIDATION_CRITERIA}
 
-        print(f"✨ Gemini: Validated {len(validated_tips)}/{len(tips)} tips")
-        return validated_tips
+Respond ONLY with a valid JSON array containing exactly one object per item:
+[{{"id": "string", "is_valid": true/false, "quality": 1-10, "category": "string", "title": "string", "summary": "string"}}]"""
 
+
+def parse_validation_response(result_text: str) -> Dict[str, dict]:
+    """Parse the validator's JSON array into a mapping of tip id -> verdict."""
+    result_text = result_text.strip()
+
+    # Clean up response
+    if result_text.startswith("```"):
+        result_text = result_text.split("```")[1]
+        if result_text.startswith("json"):
+            result_text = result_text[4:]
+
+    results = json.loads(result_text)
+    if isinstance(results, dict):
+        results = [results]
+    if not isinstance(results, list):
+        raise ValueError("expected a JSON array")
+
+    return {str(r["id"]): r for r in results if isinstance(r, dict) and "id" in r}
+
+
+THROTTLE_ERRORS = ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable")
+RETRY_HINT = re.compile(r'retry in (\d+(?:\.\d+)?)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)', re.IGNORECASE)
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 30)
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """True for quota / rate-limit errors that are worth retrying later."""
+    text = str(error).lower()
+    return (type(error).__name__ in THROTTLE_ERRORS or "429" in text
+            or "quota" in text or "rate limit" in text or "resource exhausted" in text)
+
+
+def throttle_delay(error: Exception, attempt: int) -> float:
+    """Seconds to hold off after a throttling error (server hint or jittered backoff).
+
+    Capped at CONFIG["gemini"]["max_delay"], so a bogus hint cannot stall
+    every worker behind the paused buckets.
+    """
+    settings = CONFIG["gemini"]
+    hint = RETRY_HINT.search(str(error))
+    if hint:
+        return min(float(hint.group(1) or hint.group(2)), settings["max_delay"])
+    return random.uniform(0, min(settings["max_delay"], settings["backoff_base"] * (2 ** attempt)))
+
+
+class GeminiPool:
+    """Bounded worker pool for Gemini calls under RPM / TPM limits.
+
+    Batches go on a shared queue and `workers` threads take them off. Each
+    call first takes one request from the RPM bucket and its estimated
+    prompt tokens from the TPM bucket. Throttled calls pause the buckets
+    and go back on the queue (up to max_requeues) instead of dropping their
+    tips; batches whose answer cannot be parsed are split in half and
+    requeued. Every call that was sent (answered, throttled or failed) is
+    recorded with its tokens and latency for report().
+    """
+
+    def __init__(self, model, settings: dict):
+        self.model = model
+        self.settings = settings
+        self.rpm = http_client.TokenBucket(settings["rpm"] / 60, max(1, settings["workers"]))
+        self.tpm = http_client.TokenBucket(settings["tpm"] / 60, settings["tpm"])
+        self.lock = threading.Lock()
+        self.verdicts = {}
+        self.unjudged = []
+        self.latencies = []
+        self.window = deque()  # (time, tokens) of calls in the last minute
+        self.stats = {"calls": 0, "throttled": 0, "requeued": 0, "errors": 0, "tokens": 0,
+                      "peak_rpm": 0, "peak_tpm": 0}
+
+    def record(self, latency: float, tokens: int):
+        with self.lock:
+            now = time.monotonic()
+            self.latencies.append(latency)
+            self.stats["calls"] += 1
+            self.stats["tokens"] += tokens
+            self.window.append((now, tokens))
+            while self.window[0][0] < now - 60:
+                self.window.popleft()
+            self.stats["peak_rpm"] = max(self.stats["peak_rpm"], len(self.window))
+            self.stats["peak_tpm"] = max(self.stats["peak_tpm"], sum(t for _, t in self.window))
+
+    def call(self, batch: List[Tuple[str, dict]]):
+        """One rate-limited generate_content call; returns (response, tokens used)."""
+        prompt = build_validation_prompt(batch)
+        estimate = len(prompt) // 4 + 100 * len(batch)
+        self.rpm.acquire()
+        self.tpm.acquire(estimate)
+
+        started = time.monotonic()
+        tokens = estimate  # what a throttled or failed call is charged
+        try:
+            response = self.model.generate_content(prompt)
+            usage = getattr(response, "usage_metadata", None)
+            tokens = getattr(usage, "total_token_count", 0) or estimate
+            return response
+        finally:
+            self.record(time.monotonic() - started, tokens)
+
+    def handle(self, work: "queue.Queue", batch: List[Tuple[str, dict]], attempt: int):
+        try:
+            response = self.call(batch)
+        except Exception as e:
+            throttled = is_throttle_error(e)
+            if throttled:
+                with self.lock:
+                    self.stats["throttled"] += 1
+            if throttled and attempt < self.settings["max_requeues"]:
+                # One pause per throttle window: workers throttled by the same
+                # hint do not extend it again (see TokenBucket.pause)
+                self.rpm.pause(throttle_delay(e, attempt))
+                with self.lock:
+                    self.stats["requeued"] += 1
+                work.put((batch, attempt + 1))
+                return
+            with self.lock:
+                self.stats["errors"] += 1
+                self.unjudged.extend(batch)
+            print(f"⚠️  Gemini validation error: {str(e)[:30]}")
+            return
+
+        try:
+            verdicts = parse_validation_response(response.text)
+        except (ValueError, KeyError, TypeError) as e:
+            verdicts = {}
+            error = e
+        else:
+            error = None
+
+        # Ids outside this batch are ignored: a reply echoing another batch's
+        # id must not overwrite that batch's verdict
+        verdicts = {tip_id: verdicts[tip_id] for tip_id, _ in batch if tip_id in verdicts}
+        missing = [(tip_id, tip) for tip_id, tip in batch if tip_id not in verdicts]
+        with self.lock:
+            self.verdicts.update(verdicts)
+        if not missing:
+            return
+
+        if len(batch) == 1:
+            with self.lock:
+                self.unjudged.extend(batch)
+            print(f"⚠️  Gemini validation error: {str(error or 'no verdict returned')[:30]}")
+            return
+
+        # Split whatever is still unanswered and requeue each half
+        middle = max(1, len(missing) // 2)
+        for half in (missing[:middle], missing[middle:]):
+            if half:
+                work.put((half, attempt))
+
+    def run(self, batches: List[List[Tuple[str, dict]]]) -> Dict[str, dict]:
+        """Judge the batches; returns this call's verdicts (stats accumulate across calls)."""
+        self.verdicts = {}
+        self.unjudged = []
+        work = queue.Queue()
+        for batch in batches:
+            work.put((batch, 0))
+
+        def worker():
+            while True:
+                item = work.get()
+                if item is None:
+                    work.task_done()
+                    return
+                try:
+                    self.handle(work, *item)
+                finally:
+                    work.task_done()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.settings["workers"])]
+        for thread in threads:
+            thread.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+        return self.verdicts
+
+    def report(self):
+        """Print quota usage and a per-call latency histogram."""
+        stats = self.stats
+        print(f"📈 Gemini quota: {stats['calls']} calls, {stats['tokens']} tokens, "
+              f"peak {stats['peak_rpm']}/{self.settings['rpm']} RPM, "
+              f"{stats['peak_tpm']}/{self.settings['tpm']} TPM, "
+              f"{stats['throttled']} throttled, {stats['requeued']} requeued, {stats['errors']} failed")
+        if not self.latencies:
+            return
+
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"⏱️  Gemini latency: p50 {p50:.2f}s, p95 {p95:.2f}s, max {latencies[-1]:.2f}s")
+        lower = 0
+        for upper in LATENCY_BUCKETS + (float("inf"),):
+            if lower > latencies[-1]:
+                break
+            count = sum(1 for latency in latencies if lower <= latency < upper)
+            label = f"<{upper}s" if upper != float("inf") else f">={lower}s"
+            print(f"   {label:>6} {'█' * count} {count}")
+            lower = upper
+
+
+_gemini_pool: Optional[GeminiPool] = None
+
+
+def request_gemini_verdicts(pending: List[Tuple[str, dict]]) -> Optional[Dict[str, dict]]:
+    """Ask Gemini for verdicts on (id, tip) pairs through the worker pool.
+
+    Returns None when Gemini is unavailable so the caller can fall back to
+    keyword categorization.
+    """
+    global _gemini_pool
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("⚠️  Gemini: No API key found, using keyword categorization...")
+        return None
+
+    try:
+        import google.generativeai as genai
     except ImportError:
         print("⚠️  Gemini: google-generativeai not installed, using keyword categorization...")
-        return categorize_by_keywords(tips)
+        return None
 
+    if _gemini_pool is None:
+        # One pool per run, so quota tracking spans every chunk of the pipeline
+        genai.configure(api_key=api_key)
+        _gemini_pool = GeminiPool(genai.GenerativeModel(CONFIG["gemini"]["model"]), CONFIG["gemini"])
+
+    batch_size = max(1, CONFIG["gemini"]["batch_size"])
+    batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    before = dict(_gemini_pool.stats)
+    verdicts = _gemini_pool.run(batches)
+
+    for key in ("calls", "tokens", "throttled", "requeued", "errors"):
+        METRICS.count(f"llm_{key}", _gemini_pool.stats[key] - before[key])
+    judged = sum(1 for tip_id, _ in pending if tip_id in verdicts)
+    print(f"✨ Gemini: Judged {judged}/{len(pending)} tips in {_gemini_pool.stats['calls'] - before['calls']} calls")
+    if _gemini_pool.unjudged:
+        # Not marked as seen, so they are picked up again on the next run
+        print(f"⚠️  Gemini: {len(_gemini_pool.unjudged)} tips left unjudged, will retry next run")
+    return verdicts
+
+
+# Backticks, CLI flags and `claude <subcommand>`; "/word" is left out, it
+# matches every URL path
+CODE_MARKERS = re.compile(r'`|(?<![\w-])--[a-z][a-z-]+|\bclaude (?:mcp|config|update|doctor|commit|install|migrate-installer|setup-token|-[a-z])\b')
+# Link-post scaffolding of the HN and Reddit feeds, and bare URLs
+FEED_BOILERPLATE = re.compile(
+    r'https?://\S+|^(?:Article URL|Comments URL|Points|# Comments?)\b.*$|submitted by\s+/u/\S+|\[(?:link|comments)\]',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def local_tip_score(tip: dict) -> float:
+    """Cheap 0..1 estimate that an item is an actionable Claude Code tip.
+
+    Combines keyword hits (positive and negative lists of every source),
+    question-style titles, very short bodies, command/code markers and the
+    categorizer's confidence into one logistic score. URLs and feed
+    boilerplate are stripped first, so a link post scores on its own words.
+    """
+    title = tip.get("title", "")
+    content = FEED_BOILERPLATE.sub(" ", tip.get("content", "")).strip()
+    text = (title + " " + content).lower()
+
+    matcher = keyword_matcher()
+    counts = matcher.label_counts(matcher.scan(text))
+    positive = sum(n for label, n in counts.items() if label.endswith(":keywords"))
+    negative = sum(n for label, n in counts.items() if label.endswith(":negative_keywords"))
+    _, confidence = tip_categorizer().classify(title, content)
+
+    logit = -1.0
+    logit += 0.6 * min(positive, 5)
+    logit -= 1.5 * min(negative, 3)
+    logit += 1.0 if ("claude code" in text or "claude-code" in text) else 0.0
+    logit += 0.8 if CODE_MARKERS.search(text) else 0.0
+    logit -= 1.5 if title.rstrip().endswith("?") else 0.0
+    logit -= 1.0 if len(content) < 80 else 0.0
+    logit += 1.5 * (confidence - 0.5)
+    return 1 / (1 + math.exp(-logit))
+
+
+def route_tips(pending: List[Tuple[str, dict]]) -> Dict[str, list]:
+    """Split uncached tips into local-reject and LLM tiers.
+
+    Only rejections are settled locally: an accepted tip still needs the
+    title, summary and quality score that only Gemini writes.
+    """
+    reject_below = CONFIG["routing"]["reject_below"]
+    tiers = {"reject": [], "llm": []}
+    for tip_id, tip in pending:
+        score = local_tip_score(tip)
+        tip["local_score"] = round(score, 3)
+        tiers["reject" if score < reject_below else "llm"].append((tip_id, tip))
+    return tiers
 
-def deduplicate(new_tips: list, existing_tips: dict) -> list:
-    """Remove tips that already exist in the repository."""
-    existing_hashes = existing_tips.get("hashes", set())
 
-    unique_tips = []
-    for tip in new_tips:
-        # Check title hash
-        title_hash = generate_tip_hash(tip.get("ai_title", tip.get("title", "")))
-        content_hash = generate_tip_hash(tip.get("content", "")[:200])
+def known_category(category, tip: dict) -> str:
+    """Gemini's category as one of CONFIG["categories"] ("Tooling" -> "tooling").
+
+    A slug with no category file is replaced by the categorizer's choice,
+    so the tip is not dropped at write time.
+    """
+    slug = re.sub(r"[\s_]+", "-", str(category or "").strip().lower())
+    if slug in CONFIG["categories"]:
+        return slug
+    return tip_categorizer().classify(tip.get("title", ""), tip.get("content", ""))[0]
 
-        if title_hash not in existing_hashes and content_hash not in existing_hashes:
-            unique_tips.append(tip)
-            existing_hashes.add(title_hash)
 
-    return unique_tips
+def validate_and_categorize(tips: list) -> list:
+    """
+    Use Gemini AI to validate tips and assign categories.
+
+    Tips go through tiers: cached verdicts (accepted or rejected, keyed by
+    content hash), then local heuristics that reject the obvious noise
+    (CONFIG["routing"]["reject_below"]), and the rest goes to Gemini in
+    batches of CONFIG["gemini"]["batch_size"].
+
+    Requires GEMINI_API_KEY environment variable.
+    """
+    if not tips:
+        return tips
+
+    cache = load_validation_cache()
+    indexed = [(f"t{i}", tip) for i, tip in enumerate(tips)]
+    keys = {tip_id: validation_cache_key(tip) for tip_id, tip in indexed}
+
+    verdicts = {tip_id: cache[keys[tip_id]]["verdict"] for tip_id, _ in indexed if keys[tip_id] in cache}
+    pending = [(tip_id, tip) for tip_id, tip in indexed if tip_id not in verdicts]
+    # Cheap local heuristics drop the obvious noise before any LLM call
+    tiers = route_tips(pending)
+    METRICS.cache("validation", hits=len(verdicts), misses=len(pending))
+    for tier, routed in tiers.items():
+        METRICS.count(f"routed_{tier}", len(routed))
+    batch_size = max(1, CONFIG["gemini"]["batch_size"])
+    saved = -(-len(pending) // batch_size) - -(-len(tiers["llm"]) // batch_size)
+    print(f"🧭 Routing: {len(verdicts)} cached, {len(tiers['reject'])} local reject, "
+          f"{len(tiers['llm'])} to LLM (~{saved} Gemini calls saved)")
+
+    keyword_ids = set()
+
+    for tip_id, tip in tiers["reject"]:
+        tip["judged"] = True
+        tip["rejected_locally"] = True
+        print(f"   ❌ Rejected locally: {tip.get('title', 'Unknown')[:40]}... (score={tip['local_score']})")
+
+    if tiers["llm"]:
+        fresh = request_gemini_verdicts(tiers["llm"])
+        if fresh is None:
+            categorize_by_keywords([tip for _, tip in tiers["llm"]])
+            keyword_ids.update(tip_id for tip_id, _ in tiers["llm"])
+        else:
+            now = datetime.now().isoformat()
+            fields = ("is_valid", "quality", "category", "title", "summary")
+            # Only the ids that were asked about; a reply may echo others
+            for tip_id, _ in tiers["llm"]:
+                result = fresh.get(tip_id)
+                if result is None:
+                    continue
+                verdict = {field: result.get(field) for field in fields if field in result}
+                cache[keys[tip_id]] = {"verdict": verdict, "cached_at": now}
+                verdicts[tip_id] = verdict
+            save_validation_cache(cache)
+
+    min_quality = CONFIG["gemini"]["min_quality"]
+    validated_tips = []
+    for tip_id, tip in indexed:
+        if tip_id in keyword_ids:
+            tip["judged"] = True
+            validated_tips.append(tip)
+            continue
+
+        result = verdicts.get(tip_id)
+        if result is None:
+            # Do NOT add tips that fail validation - skip them
+            continue
+        tip["judged"] = True
+
+        # STRICT: Must be valid AND quality >= min_quality
+        if result.get("is_valid") and (result.get("quality") or 0) >= min_quality:
+            tip["category"] = known_category(result.get("category"), tip)
+            tip["ai_title"] = result.get("title", tip["title"])
+            tip["summary"] = result.get("summary", "")
+            tip["quality"] = result.get("quality", 5)
+            validated_tips.append(tip)
+        else:
+            # Log rejected tips for debugging
+            print(f"   ❌ Rejected: {tip.get('title', 'Unknown')[:40]}... (valid={result.get('is_valid')}, quality={result.get('quality')})")
+
+    print(f"✨ Gemini: Validated {len(validated_tips)}/{len(tips)} tips")
+    return validated_tips
+
+
+def iter_unique(new_tips, existing_tips: dict, ledger: Optional[dict] = None):
+    """Yield only tips that do not already exist in the repository.
+
+    A tip is dropped when its normalized title matches an existing tip (or
+    another tip in this run), or when the MinHash/LSH index over title +
+    body finds a reworded repost. The index is built when the first tip
+    arrives; dropped tips are marked in `ledger` if one is given.
+    """
+    index = None
+    for i, tip in enumerate(new_tips):
+        if index is None:
+            index = build_near_duplicate_index(existing_tips)
+        title = tip.get("ai_title", tip.get("title", ""))
+        text = similarity_text(title, tip.get("summary") or tip.get("content", ""))
+        key = index.same_title(title)
+        if key is not None:
+            print(f"   ♻️  Same title as #{key}: {tip.get('title', '')[:40]}...")
+        else:
+            matches = index.query(text)
+            if matches:
+                key, similarity = matches[0]
+                print(f"   ♻️  Near-duplicate of #{key} ({similarity:.2f}): {tip.get('title', '')[:40]}...")
+        if key is not None:
+            if ledger is not None:
+                mark_seen(ledger, [tip])
+            continue
+        index.add(f"new-{i}", text, title=title)
+        yield tip
+
+
+class RepoTransaction:
+    """Stage repository file writes and apply them together.
+
+    Staged files are first written to temp files next to their targets;
+    only when every temp file is on disk are they renamed into place. A
+    crash while staging or writing leaves the repository untouched.
+    Callbacks registered with after_commit run once the files are in place.
+    """
 
+    def __init__(self):
+        self._staged = {}
+        self._after_commit = []
 
-def append_tip_to_category(tip: dict, tip_number: int) -> bool:
-    """Append a new tip to the category markdown file.
+    def after_commit(self, callback: Callable[[], None]):
+        """Run callback (once, however often it is registered) after commit()."""
+        if callback not in self._after_commit:
+            self._after_commit.append(callback)
+
+    def read_text(self, path) -> str:
+        path = Path(path)
+        if path in self._staged:
+            return self._staged[path]
+        return path.read_text()
+
+    def write_text(self, path, content: str):
+        self._staged[Path(path)] = content
+
+    def staged_text(self, path) -> Optional[str]:
+        return self._staged.get(Path(path))
+
+    def commit(self):
+        written = []
+        try:
+            for path, content in self._staged.items():
+                tmp_path = path.with_name(f".{path.name}.tmp")
+                tmp_path.write_text(content)
+                written.append((tmp_path, path))
+        except Exception:
+            for tmp_path, _ in written:
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+        for tmp_path, path in written:
+            os.replace(tmp_path, path)
+        self._staged = {}
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+
+def render_tip_entry(tip: dict, tip_number: int) -> str:
+    """Render one tip in the category file format.
 
     Format:
     ## N. Tip Title
@@ -579,7 +1791,20 @@ def append_tip_to_category(tip: dict, tip_number: int) -> bool:
 
     ---
     """
-    category = tip.get("category", "workflow")
+    return f"""
+## {tip_number}. {tip.get('ai_title', tip.get('title', 'New Tip'))}
+**Source:** {tip.get('author', 'Community')} ({tip.get('source', 'community').title()})
+
+{tip.get('summary', tip.get('content', '')[:300])}
+
+[Original]({tip.get('url', '#')}) | Added: {datetime.now().strftime('%Y-%m-%d')}
+
+---
+"""
+
+
+def append_tips_to_category(category: str, numbered_tips: List[Tuple[int, dict]], txn: RepoTransaction) -> bool:
+    """Stage all new tips for one category file in a single read-modify-write."""
     category_file = Path(f"tips/categories/{category}.md")
 
     if not category_file.exists():
@@ -587,71 +1812,109 @@ def append_tip_to_category(tip: dict, tip_number: int) -> bool:
         return False
 
     # Read existing content
-    content = category_file.read_text()
+    content = txn.read_text(category_file)
 
     # Find the last tip entry (before the footer)
     footer_marker = "*[Back to Categories]"
-
-    # Create new tip entry
-    new_tip = f"""
-## {tip_number}. {tip.get('ai_title', tip.get('title', 'New Tip'))}
-**Source:** {tip.get('author', 'Community')} ({tip.get('source', 'community').title()})
-
-{tip.get('summary', tip.get('content', '')[:300])}
-
-[Original]({tip.get('url', '#')}) | Added: {datetime.now().strftime('%Y-%m-%d')}
-
----
-"""
+    entries = [render_tip_entry(tip, number) for number, tip in numbered_tips]
 
     # Insert before footer or append at end
     if footer_marker in content:
         parts = content.split(footer_marker)
-        new_content = parts[0] + new_tip + "\n" + footer_marker + parts[1]
+        new_content = parts[0] + "".join(entry + "\n" for entry in entries) + footer_marker + parts[1]
     else:
-        new_content = content.rstrip() + "\n" + new_tip
+        new_content = content.rstrip() + "\n" + "".join(entries)
 
-    category_file.write_text(new_content)
-    print(f"✅ Added tip #{tip_number} to {category}.md")
+    txn.write_text(category_file, new_content)
+    txn.after_commit(update_search_index)
+    for number, _ in numbered_tips:
+        print(f"✅ Added tip #{number} to {category}.md")
     return True
 
 
-def update_index(new_tips: list):
-    """Update the tips/index.json file."""
+def append_tip_to_category(tip: dict, tip_number: int, txn: Optional[RepoTransaction] = None) -> bool:
+    """Append a single tip to its category file (committed immediately without txn)."""
+    own_txn = txn is None
+    txn = txn or RepoTransaction()
+    added = append_tips_to_category(tip.get("category", "workflow"), [(tip_number, tip)], txn)
+    if added and own_txn:
+        txn.commit()
+    return added
+
+
+def collect_tip_records(txn: Optional[RepoTransaction] = None) -> list:
+    """Tip records for every category, re-parsing only the files staged in txn."""
+    staged = {}
+    if txn:
+        for category in CONFIG["categories"]:
+            text = txn.staged_text(f"tips/categories/{category}.md")
+            if text is not None:
+                staged[category] = text
+
+    cached = {}
+    unchanged = [c for c in CONFIG["categories"] if c not in staged]
+    cache_path = Path(CONFIG["cache"]["dir"]) / "tip-store.json"
+    for record in tip_store.load_records(Path("."), unchanged, cache_path):
+        cached.setdefault(record["category"], []).append(record)
+
+    records = []
+    for category in CONFIG["categories"]:
+        if category in staged:
+            records.extend(tip_store.parse_category(staged[category].encode(), category))
+        else:
+            records.extend(cached.get(category, []))
+    return records
+
+
+def update_search_index():
+    """Add newly committed tips to the BM25 search index in .cache/.
+
+    Only the new tips are tokenized (see search_index.SearchIndex.sync).
+    The index is a cache, so a failure is reported and the run goes on.
+    """
+    stats = {}
+    try:
+        with METRICS.stage("search_index") as stage:
+            search_index.open_index(Path("."), Path(CONFIG["cache"]["dir"]) / "search-index.bin",
+                                    collect_tip_records(), stats)
+            stage["items_out"] = stats.get("added", 0)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Search index not updated: {e}")
+        return
+    rebuilt = " (rebuilt)" if stats.get("rebuilt") else ""
+    print(f"🔎 Search index: {stats.get('added', 0)} tips added{rebuilt}")
+
+
+def update_index(txn: Optional[RepoTransaction] = None):
+    """Regenerate tips/index.json from the parsed tip records.
+
+    Counts, the highest tip number and the per-tip table (byte offset,
+    length and content hash) are derived from the category files, so the
+    index never drifts from them.
+    """
     index_file = Path("tips/index.json")
 
     if index_file.exists():
-        with open(index_file) as f:
-            index = json.load(f)
+        index = json.loads(txn.read_text(index_file) if txn else index_file.read_text())
     else:
         index = {"categories": [], "totalTips": 0, "lastUpdated": ""}
 
-    # Update counts (case-insensitive category matching)
-    for tip in new_tips:
-        category = tip.get("category", "workflow").lower()
-        # Find existing category (case-insensitive) - use slug for matching
-        cat_entry = next(
-            (c for c in index["categories"] if c.get("slug", c["name"]).lower() == category),
-            None
-        )
-        if cat_entry:
-            cat_entry["count"] = cat_entry.get("count", 0) + 1
-        # Don't create new categories - only update existing ones
-
-    index["totalTips"] = index.get("totalTips", 0) + len(new_tips)
+    index = tip_store.build_index(collect_tip_records(txn), index)
     index["lastUpdated"] = datetime.now().isoformat()
 
-    with open(index_file, "w") as f:
-        json.dump(index, f, indent=2)
+    if txn:
+        txn.write_text(index_file, tip_store.dump_index(index))
+    else:
+        index_file.write_text(tip_store.dump_index(index))
 
 
-def update_readme_today_tip(new_tips: list):
+def update_readme_today_tip(new_tips: list, txn: Optional[RepoTransaction] = None):
     """Update the 'Today's Tip' section in README."""
     readme_path = Path("README.md")
     if not readme_path.exists():
         return
 
-    content = readme_path.read_text()
+    content = txn.read_text(readme_path) if txn else readme_path.read_text()
 
     # If we have new tips, feature one
     if new_tips:
@@ -671,69 +1934,284 @@ def update_readme_today_tip(new_tips: list):
         if re.search(pattern, content, re.DOTALL):
             content = re.sub(pattern, today_tip, content, flags=re.DOTALL)
 
-        readme_path.write_text(content)
+        if txn:
+            txn.write_text(readme_path, content)
+        else:
+            readme_path.write_text(content)
         print(f"📝 README: Updated Today's Tip")
     else:
         print("📝 README: No new tips to feature")
 
 
-def update_repository(tips: list):
-    """Add new tips to the appropriate category files."""
+def update_repository(tips: list, existing: Optional[dict] = None, update_readme: bool = True,
+                      on_numbered: Optional[Callable[[List[Tuple[int, dict]]], None]] = None):
+    """Add new tips to the appropriate category files.
+
+    existing["next_number"] is advanced past the numbers used, so repeated
+    calls during one run keep numbering in order. on_numbered, if given,
+    receives the (number, tip) pairs before anything is written. Returns
+    the tips that were written; tips whose category has no file are not.
+    """
     if not tips:
         print("✅ No new tips to add today.")
-        return
+        return []
 
     print(f"📦 Adding {len(tips)} new tips...")
 
     # Get current tip count for numbering
-    existing = get_existing_tips()
+    existing = existing or get_existing_tips()
     tip_number = existing.get("next_number", 51)
 
-    added_count = 0
+    # Number tips in order, skipping categories that have no file
+    by_category = {}
     for tip in tips:
-        if append_tip_to_category(tip, tip_number):
-            added_count += 1
-            tip_number += 1
+        category = tip.get("category", "workflow")
+        if not Path(f"tips/categories/{category}.md").exists():
+            print(f"⚠️  Category file not found: tips/categories/{category}.md")
+            continue
+        by_category.setdefault(category, []).append((tip_number, tip))
+        tip_number += 1
+    existing["next_number"] = tip_number
+    if on_numbered:
+        on_numbered([pair for numbered_tips in by_category.values() for pair in numbered_tips])
+
+    # One read-modify-write per category file, plus index and README,
+    # all renamed into place together at the end
+    txn = RepoTransaction()
+    added = []
+    with METRICS.stage("categories", items_in=len(tips)) as stage:
+        for category, numbered_tips in by_category.items():
+            if append_tips_to_category(category, numbered_tips, txn):
+                added.extend(tip for _, tip in numbered_tips)
+        stage["items_out"] = len(added)
 
     # Update index
-    update_index(tips)
+    with METRICS.stage("index"):
+        update_index(txn)
 
     # Update README
-    update_readme_today_tip(tips)
+    if update_readme:
+        with METRICS.stage("readme"):
+            update_readme_today_tip(added, txn)
 
-    print(f"✅ Added {added_count} new tips to category files")
+    with METRICS.stage("commit"):
+        txn.commit()
+    print(f"✅ Added {len(added)} new tips to category files")
+    return added
 
 
-def main():
-    print("="*50)
-    print(f"🚀 Claude Code Daily - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("="*50)
+def chunked(items, size: int):
+    """Group an iterable into lists of at most `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def buffered(items, size: int):
+    """Run an upstream generator in a background thread, at most `size` items ahead.
+
+    Lets fetching and parsing continue while later stages wait on Gemini;
+    an exception in the upstream stage is re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=max(1, size))
+    end = object()
+
+    def produce():
+        try:
+            for item in items:
+                buffer.put((item, None))
+            buffer.put((end, None))
+        except BaseException as e:
+            buffer.put((end, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item, error = buffer.get()
+        if item is end:
+            if error is not None:
+                raise error
+            return
+        yield item
+
+
+def iter_new_tips(prefetched: dict, checkpoint: Optional[RunCheckpoint] = None):
+    """Fetch stage: tips from every source in order, as each feed arrives.
+
+    Once every feed is read the full list is stored in the checkpoint.
+    """
+    fetched = []
+    for source in SOURCES:
+        for tip in iter_source_tips(source, prefetched):
+            fetched.append(tip)
+            yield tip
+    for tip in fetch_twitter_tips():  # Will skip if disabled
+        fetched.append(tip)
+        yield tip
+    save_feed_cache()
+    if checkpoint is not None:
+        checkpoint.record_fetched(fetched)
+
+    http_stats = http_client.get_client().stats
+    METRICS.count("http_requests", http_stats["requests"])
+    METRICS.count("http_retries", http_stats["retries"])
+    print(f"🌐 HTTP: {http_stats['requests']} requests, {http_stats['retries']} retries, "
+          f"{http_stats['throttled']} throttled, {http_stats['rate_wait']:.1f}s rate-limit wait")
+    print(f"🌐 Found {len(fetched)} potential tips")
+
+
+def iter_validated(tips, ledger: dict, checkpoint: Optional[RunCheckpoint] = None):
+    """Validate stage: judge tips validate_chunk at a time, yielding accepted ones.
+
+    Tips Gemini rejected are final, so they are marked seen straight away;
+    local rejects are not, so they are scored again next run. Accepted tips
+    are marked once they have been written. Items the checkpoint already has
+    an outcome for are not judged again.
+    """
+    judged = 0
+    outcomes = checkpoint.outcomes if checkpoint is not None else {}
+    for chunk in chunked(tips, CONFIG["pipeline"]["validate_chunk"]):
+        judged += len(chunk)
+        pending = [tip for tip in chunk if checkpoint_key(tip) not in outcomes]
+        fresh = validate_and_categorize(pending) if pending else []
+        if checkpoint is not None and pending:
+            checkpoint.record_outcomes(pending, fresh)
+
+        # Keep input order, taking earlier verdicts from the checkpoint
+        fresh_ids = {id(tip) for tip in fresh}
+        accepted = []
+        for tip in chunk:
+            known = outcomes.get(checkpoint_key(tip))
+            if id(tip) in fresh_ids:
+                accepted.append(tip)
+            elif known and known["accepted"]:
+                accepted.append(dict(known["tip"]))
+            elif tip.get("rejected_locally") or (known and known.get("local")):
+                continue
+            elif tip.get("judged") or known:
+                mark_seen(ledger, [tip])
+        yield from accepted
+
+    if not judged:
+        print("📭 No new tips found from sources")
+
+
+def write_tips(tips, existing: dict, ledger: dict, checkpoint: Optional[RunCheckpoint] = None) -> int:
+    """Sink: commit accepted tips write_batch at a time.
+
+    Each group is numbered, written and committed as one transaction, then
+    marked seen and the ledger saved, so a failure later in the run keeps
+    everything written so far. Only tips update_repository actually wrote
+    are recorded, marked seen and counted; the rest are tried again next
+    run. Only the first group of a run (including a resumed one) features a
+    tip in the README. Tips the checkpoint records as written are skipped.
+    """
+    written = 0
+    featured = checkpoint is not None and bool(checkpoint.written)
+    for chunk in chunked(tips, CONFIG["pipeline"]["write_batch"]):
+        if checkpoint is not None:
+            chunk = [tip for tip in chunk if checkpoint_key(tip) not in checkpoint.written]
+            if not chunk:
+                continue
+        with METRICS.stage("write", items_in=len(chunk)):
+            added = update_repository(chunk, existing, update_readme=not featured,
+                                      on_numbered=checkpoint.record_numbers if checkpoint is not None else None)
+        featured = True
+        if checkpoint is not None:
+            checkpoint.record_written(added)
+        mark_seen(ledger, added)
+        save_seen_ledger(ledger)
+        written += len(added)
+
+    print(f"✨ Unique new tips: {written}")
+    if not written:
+        print("✅ No new tips to add today.")
+    return written
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fetch, validate and publish new Claude Code tips.")
+    parser.add_argument("--report", default=str(Path(CONFIG["cache"]["dir"]) / "run-report.json"),
+                        help="where to write the JSON run report")
+    parser.add_argument("--resume", action="store_true",
+                        help="finish an interrupted run from .cache/checkpoint.json without refetching or re-validating")
+    parser.add_argument("--profile", choices=("cpu", "memory"),
+                        help="run under cProfile (cpu) or tracemalloc (memory) and add the top entries to the report")
+    return parser.parse_args(argv)
+
+
+def run_pipeline(resume: bool = False):
+    http_client.configure(**CONFIG["http"])
+    settings = CONFIG["pipeline"]
 
     # Load existing tips
-    existing = get_existing_tips()
+    with METRICS.stage("load_archive") as stage:
+        existing = get_existing_tips()
+        stage["items_out"] = len(existing.get("tips", []))
     print(f"📊 Existing tips: {len(existing.get('tips', []))}")
+    ledger = load_seen_ledger()
+
+    checkpoint_path = Path(CONFIG["cache"]["dir"]) / "checkpoint.json"
+    checkpoint = RunCheckpoint.load(checkpoint_path) if resume else None
+    if checkpoint is not None:
+        checkpoint.reconcile(existing)
+        print(f"⏯️  Resuming run from {checkpoint.started_at}: "
+              f"{'fetched items saved' if checkpoint.fetched is not None else 'refetching'}, "
+              f"{len(checkpoint.outcomes)} verdicts, {len(checkpoint.written)} tips already written")
+    else:
+        if resume:
+            print("⏯️  No interrupted run to resume, starting a fresh run")
+        checkpoint = RunCheckpoint(checkpoint_path)
+        checkpoint.first_number = existing["next_number"]
+        checkpoint.save()
+
+    global _training_cutoff
+    _training_cutoff = checkpoint.first_number
+    tip_categorizer.cache_clear()
+
+    # Fetch from sources (Dev.to + HN + Reddit), all feeds in parallel;
+    # parsing streams off the socket, so it is timed together with the download
+    if checkpoint.fetched is not None:
+        fetched = METRICS.stream("fetch", lambda: iter(checkpoint.fetched))
+    else:
+        prefetched = fetch_feeds_concurrently(get_feed_jobs())
+        fetched = METRICS.stream("fetch", lambda: iter_new_tips(prefetched, checkpoint))
 
-    # Fetch from sources (Dev.to + HN + Reddit)
-    devto_tips = fetch_devto_tips()
-    hn_tips = fetch_hackernews_tips()
-    reddit_tips = fetch_reddit_tips()
-    twitter_tips = fetch_twitter_tips()  # Will skip if disabled
+    # Skip anything processed on an earlier run before paying for validation
+    fresh = METRICS.stream("seen_filter", lambda items: iter_unseen(items, ledger, existing), fetched)
 
-    all_new_tips = devto_tips + hn_tips + reddit_tips + twitter_tips
-    print(f"🌐 Found {len(all_new_tips)} potential tips")
+    # Validate and categorize while fetching continues in the background
+    validated = METRICS.stream("validate", lambda items: iter_validated(items, ledger, checkpoint),
+                               buffered(fresh, settings["buffer_size"]))
 
-    if all_new_tips:
-        # Validate and categorize
-        validated = validate_and_categorize(all_new_tips)
+    # Deduplicate, then write in committed groups
+    unique = METRICS.stream("dedup", lambda items: iter_unique(items, existing, ledger), validated)
+    write_tips(unique, existing, ledger, checkpoint)
 
-        # Deduplicate
-        unique = deduplicate(validated, existing)
-        print(f"✨ Unique new tips: {len(unique)}")
+    save_seen_ledger(ledger)
+    checkpoint.finish()
 
-        # Update repository
-        update_repository(unique)
-    else:
-        print("📭 No new tips found from sources")
+    if _gemini_pool is not None:
+        _gemini_pool.report()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("="*50)
+    print(f"🚀 Claude Code Daily - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print("="*50)
+
+    with METRICS.profile(args.profile):
+        run_pipeline(resume=args.resume)
+
+    report = METRICS.write(Path(args.report))
+    print(f"📊 Run report ({args.report}):")
+    print(json.dumps(report, indent=2))
 
     print("="*50)
     print("✅ Daily update complete!")
@@ -0,0 +1,315 @@
+"""
+Email Render - single-pass markdown to email HTML / plain text for the newsletter
+
+Tips use a small subset of markdown: paragraphs, **bold**, *italic*,
+`code`, [links](https://...), fenced code blocks, "-" and "1." lists,
+"#" headings, "> " quotes and "---" rules. tokenize() walks the lines of a
+tip once and produces block tokens; render_html() / render_text() turn the
+tokens into inline-styled email HTML or the plain-text part. Inline markup
+is handled by one regex scan per block, and all other text is HTML-escaped.
+
+A fence only closes on a line with at least as many backticks and no info
+string. Tips often show a ```bash block inside a ```markdown example with
+fences of the same length, so inside markdown fences an opening fence with
+an info string nests and its bare closing fence stays part of the example.
+An unclosed fence runs to the end of the tip.
+
+FragmentCache keeps rendered fragments keyed by a hash of the markdown, so
+re-rendering a preview or an issue with the same tips costs a dict lookup.
+
+Usage:
+    cache = FragmentCache(Path(".cache/newsletter-fragments.json"))
+    html = cache.get("html", markdown)
+    text = cache.get("text", markdown)
+    cache.save()
+"""
+
+import hashlib
+import html
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import tip_store
+
+# Bump when the output changes, so cached fragments are re-rendered
+RENDER_VERSION = 2
+
+PARAGRAPH_STYLE = "margin: 8px 0; color: #a1a1aa;"
+PRE_STYLE = ("background: #000; padding: 12px; border-radius: 4px; overflow-x: auto; "
+             "margin: 12px 0; color: {color}; white-space: pre-wrap;")
+CODE_COLORS = {"bash": "#22c55e", "sh": "#22c55e", "shell": "#22c55e",
+               "markdown": "#a1a1aa", "md": "#a1a1aa", "json": "#fbbf24"}
+DEFAULT_CODE_COLOR = "#d4d4d8"
+HEADING_STYLE = "color: #fafafa; font-weight: 600; margin: 12px 0 4px;"
+LIST_STYLE = "margin: 8px 0; padding-left: 20px; color: #a1a1aa;"
+QUOTE_STYLE = "margin: 8px 0; padding-left: 12px; border-left: 2px solid #3f3f46; color: #d4d4d8;"
+RULE_STYLE = "border: none; border-top: 1px solid #27272a; margin: 12px 0;"
+INLINE_CODE_STYLE = "background: #18181b; padding: 1px 4px; border-radius: 3px; color: #e4e4e7;"
+STRONG_STYLE = "color: #d4d4d8;"
+LINK_STYLE = "color: #06b6d4;"
+# Bold labels with their own colour, e.g. "**Why it works:**"
+LABEL_STYLES = {"Why it works:": "color: #06b6d4;"}
+
+FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})\s*([^`\s]*)')
+HEADING = re.compile(r'^ {0,3}(#{1,6})\s+(.*?)\s*#*\s*$')
+RULE = re.compile(r'^ {0,3}([-*_])(?:\s*\1){2,}\s*$')
+LIST_ITEM = re.compile(r'^\s{0,3}(?:([-*+])|(\d{1,9})[.)])\s+(.*)$')
+QUOTE = re.compile(r'^ {0,3}>\s?(.*)$')
+
+INLINE = re.compile(r'''
+    (?P<ticks>`+)(?P<code>.+?)(?P=ticks)                        # `code`
+  | \[(?P<label>[^\]\n]+)\]\((?P<href>(?:[^()\s]|\([^()\s]*\))+)\)  # [text](url), url may hold (...)
+  | \*\*(?P<bold>[^\s*](?:.*?[^\s])?)\*\*                       # **bold**
+  | (?<![\w*])[*_](?P<em>[^\s*_](?:[^*_\n]*[^\s*_])?)[*_](?![\w*])  # *em* / _em_
+  | (?P<url>https?://[^\s<>()\[\]]+[^\s<>()\[\].,;:!?'"])       # bare URL
+''', re.X)
+SAFE_SCHEMES = ("http://", "https://", "mailto:")
+NESTING_LANGS = {"markdown", "md"}
+
+# Block tokens: ("para", lines), ("code", lang, lines), ("heading", level, text),
+# ("list", start or None for bullets, items), ("quote", lines), ("rule",)
+Token = Tuple
+
+
+def tokenize(markdown: str) -> List[Token]:
+    """Split markdown into block tokens in one pass over its lines."""
+    tokens = []
+    paragraph = []
+    fence = None  # [marker char, length, lang, lines, nested depth] while inside a code block
+    items = None  # (start, items) while inside a list
+    quote = None
+
+    def flush():
+        nonlocal paragraph, items, quote
+        if paragraph:
+            tokens.append(("para", paragraph))
+            paragraph = []
+        if items is not None:
+            tokens.append(("list", items[0], items[1]))
+            items = None
+        if quote is not None:
+            tokens.append(("quote", quote))
+            quote = None
+
+    for line in markdown.splitlines():
+        if fence is not None:
+            marker, length, lang, lines, depth = fence
+            closing = line.strip()
+            if len(closing) >= length and not closing.strip(marker):
+                if depth:
+                    fence[4] -= 1
+                    lines.append(line)
+                else:
+                    tokens.append(("code", lang, lines))
+                    fence = None
+                continue
+            if lang in NESTING_LANGS:
+                inner = FENCE.match(line)
+                if inner and inner.group(2) and inner.group(1)[0] == marker:
+                    fence[4] += 1
+            lines.append(line)
+            continue
+
+        opening = FENCE.match(line)
+        if opening:
+            flush()
+            fence = [opening.group(1)[0], len(opening.group(1)), opening.group(2).lower(), [], 0]
+            continue
+
+        if not line.strip():
+            flush()
+            continue
+
+        heading = HEADING.match(line)
+        if heading:
+            flush()
+            tokens.append(("heading", len(heading.group(1)), heading.group(2)))
+            continue
+
+        if RULE.match(line):
+            flush()
+            tokens.append(("rule",))
+            continue
+
+        item = LIST_ITEM.match(line)
+        # Like CommonMark, only "-" or "1." may interrupt a paragraph ("2026. was...")
+        if item and (not paragraph or not item.group(2) or item.group(2) == "1"):
+            start = int(item.group(2)) if item.group(2) else None
+            if items is None or (start is None) != (items[0] is None):
+                flush()
+                items = (start, [])
+            items[1].append(item.group(3))
+            continue
+
+        quoted = QUOTE.match(line)
+        if quoted:
+            if quote is None:
+                flush()
+                quote = []
+            quote.append(quoted.group(1))
+            continue
+
+        if items is not None and line[:1].isspace():
+            items[1][-1] += " " + line.strip()  # continuation of the last item
+        elif items is not None or quote is not None:
+            flush()
+            paragraph.append(line)
+        else:
+            paragraph.append(line)
+
+    if fence is not None:
+        tokens.append(("code", fence[2], fence[3]))  # unclosed fence runs to the end
+    flush()
+    return tokens
+
+
+def _body_tokens(markdown: str) -> List[Token]:
+    tokens = tokenize(markdown)
+    while tokens and tokens[-1] == ("rule",):
+        tokens.pop()  # the "---" separator between tips
+    return tokens
+
+
+def inline_html(text: str) -> str:
+    """Render inline markup (code, links, bold, italic, bare URLs), escaping the rest."""
+    out = []
+    position = 0
+    for match in INLINE.finditer(text):
+        out.append(html.escape(text[position:match.start()], quote=False))
+        position = match.end()
+        if match.group("code") is not None:
+            out.append(f'<code style="{INLINE_CODE_STYLE}">{html.escape(match.group("code").strip(), quote=False)}</code>')
+        elif match.group("href") is not None:
+            href = match.group("href")
+            label = inline_html(match.group("label"))
+            if href.startswith(SAFE_SCHEMES):
+                out.append(f'<a href="{html.escape(href)}" style="{LINK_STYLE}">{label}</a>')
+            else:
+                out.append(label)
+        elif match.group("bold") is not None:
+            bold = match.group("bold")
+            style = LABEL_STYLES.get(bold, STRONG_STYLE)
+            out.append(f'<strong style="{style}">{inline_html(bold)}</strong>')
+        elif match.group("em") is not None:
+            out.append(f'<em>{inline_html(match.group("em"))}</em>')
+        else:
+            url = match.group("url")
+            out.append(f'<a href="{html.escape(url)}" style="{LINK_STYLE}">{html.escape(url, quote=False)}</a>')
+    out.append(html.escape(text[position:], quote=False))
+    return "".join(out)
+
+
+def inline_text(text: str) -> str:
+    """Strip inline markup for the plain-text part; links become "text (url)".
+
+    >>> inline_text("See [Unix](https://en.wikipedia.org/wiki/Unix_(disambiguation)).")
+    'See Unix (https://en.wikipedia.org/wiki/Unix_(disambiguation)).'
+    """
+    def replace(match):
+        if match.group("code") is not None:
+            return match.group("code").strip()
+        if match.group("href") is not None:
+            label = inline_text(match.group("label"))
+            return label if label == match.group("href") else f'{label} ({match.group("href")})'
+        if match.group("bold") is not None:
+            return inline_text(match.group("bold"))
+        if match.group("em") is not None:
+            return inline_text(match.group("em"))
+        return match.group("url")
+    return INLINE.sub(replace, text)
+
+
+def render_html(markdown: str) -> str:
+    """Render a tip body as inline-styled email HTML."""
+    out = []
+    for token in _body_tokens(markdown):
+        kind = token[0]
+        if kind == "para":
+            out.append(f'<p style="{PARAGRAPH_STYLE}">' + "<br>".join(inline_html(line.strip()) for line in token[1]) + "</p>")
+        elif kind == "code":
+            color = CODE_COLORS.get(token[1], DEFAULT_CODE_COLOR)
+            out.append(f'<pre style="{PRE_STYLE.format(color=color)}">' + html.escape("\n".join(token[2]), quote=False) + "</pre>")
+        elif kind == "heading":
+            out.append(f'<div style="{HEADING_STYLE}">{inline_html(token[2])}</div>')
+        elif kind == "list":
+            start = token[1]
+            tag = "ul" if start is None else "ol"
+            attrs = "" if start in (None, 1) else f' start="{start}"'
+            out.append(f'<{tag}{attrs} style="{LIST_STYLE}">'
+                       + "".join(f"<li>{inline_html(item)}</li>" for item in token[2]) + f"</{tag}>")
+        elif kind == "quote":
+            out.append(f'<blockquote style="{QUOTE_STYLE}">' + "<br>".join(inline_html(line) for line in token[1]) + "</blockquote>")
+        else:
+            out.append(f'<hr style="{RULE_STYLE}">')
+    return "\n".join(out)
+
+
+def render_text(markdown: str) -> str:
+    """Render a tip body as plain text for the text/plain part."""
+    out = []
+    for token in _body_tokens(markdown):
+        kind = token[0]
+        if kind == "para":
+            out.append("\n".join(inline_text(line.strip()) for line in token[1]))
+        elif kind == "code":
+            out.append("\n".join("    " + line for line in token[2]))
+        elif kind == "heading":
+            out.append(inline_text(token[2]))
+        elif kind == "list":
+            start = token[1]
+            out.append("\n".join(
+                f"- {inline_text(item)}" if start is None else f"{start + i}. {inline_text(item)}"
+                for i, item in enumerate(token[2])
+            ))
+        elif kind == "quote":
+            out.append("\n".join("> " + inline_text(line) for line in token[1]))
+        else:
+            out.append("---")
+    return "\n\n".join(out)
+
+
+RENDERERS: Dict[str, Callable[[str], str]] = {"html": render_html, "text": render_text}
+
+
+class FragmentCache:
+    """Rendered fragments keyed by a hash of (render version, kind, markdown).
+
+    Entries used most recently are kept; at most max_entries are saved.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 5000):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.fragments: Dict[str, str] = {}
+        self.changed = False
+        if self.path:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get("version") == RENDER_VERSION:
+                    self.fragments = data.get("fragments", {})
+            except (OSError, ValueError):
+                pass
+
+    def get(self, kind: str, markdown: str) -> str:
+        key = hashlib.sha1(f"{RENDER_VERSION}\0{kind}\0{markdown}".encode()).hexdigest()[:20]
+        fragment = self.fragments.pop(key, None)
+        if fragment is None:
+            self.misses += 1
+            fragment = RENDERERS[kind](markdown)
+            self.changed = True
+        else:
+            self.hits += 1
+        self.fragments[key] = fragment  # (re)insert as most recently used
+        return fragment
+
+    def save(self):
+        if not self.path or not self.changed:
+            return
+        fragments = dict(list(self.fragments.items())[-self.max_entries:])
+        if tip_store.write_json_atomic(self.path, {"version": RENDER_VERSION, "fragments": fragments}, optional=True):
+            self.changed = False
@@ -0,0 +1,257 @@
+"""
+HTTP Client - shared, rate-limit-aware requests layer for the automation scripts
+
+Every outbound call from daily-update.py and weekly-newsletter.py goes
+through one pooled requests.Session so connections to the same host are
+reused, and through a per-host token bucket so bursts (e.g. eight Reddit
+feeds at once) stay under each site's rate limit.
+
+Transient failures are retried instead of costing a day's content:
+
+  - 429 / 503 honour Retry-After (seconds or an HTTP date), capped at
+    max_delay
+  - other 5xx responses, timeouts and connection errors back off
+    exponentially with full jitter (random 0..base * 2^attempt)
+
+Non-idempotent requests (POST) are only retried when the server cannot have
+acted on them: 429, or a connection that was never made (connect timeout,
+refused connection, DNS failure). A connection dropped after the request
+went out is not retried. Pass idempotent=True for POSTs that are safe to
+repeat.
+
+deadline (a time.monotonic() value) bounds a request including its retries:
+each attempt's timeout is clamped to the time left and no retry starts
+after it.
+
+Usage:
+    import http_client
+    http_client.configure(host_rates={"www.reddit.com": (0.5, 2)})
+    response = http_client.get(url, timeout=30)
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+DEFAULTS = {
+    "timeout": 30,
+    "retries": 3,              # retries after the first attempt
+    "backoff_base": 1.0,       # seconds; attempt n waits up to base * 2^n
+    "max_delay": 60.0,         # cap for backoff and Retry-After
+    "pool_size": 16,           # connections kept per host
+    "default_rate": (5.0, 5),  # (requests per second, burst) for unlisted hosts
+    "host_rates": {}           # host -> (requests per second, burst)
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` saved.
+
+    pause() holds every caller until a deadline; overlapping pauses (several
+    workers seeing the same Retry-After) extend it to the latest one rather
+    than adding up.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, count: float = 1) -> float:
+        """Take `count` tokens, sleeping until they are available. Returns seconds waited."""
+        count = min(count, self.capacity)
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= count:
+                        self.tokens -= count
+                        return waited
+                    delay = (count - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> bool:
+        """Let nobody call the host for `seconds` (Retry-After).
+
+        Returns False if a pause lasting at least that long was already
+        active. One call may go at the deadline; the bucket refills as
+        usual from there.
+        """
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until <= self.paused_until:
+                return False
+            self.paused_until = until
+            self.tokens = 1.0
+            self.updated = until
+            return True
+
+
+def never_sent(error: Exception) -> bool:
+    """True if a request failed before reaching the server (no connection was made)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """Pooled session with per-host token buckets and retry/backoff."""
+
+    def __init__(self, **settings):
+        self.settings = {**DEFAULTS, **settings}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.settings["pool_size"],
+                              pool_maxsize=self.settings["pool_size"])
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "rate_wait": 0.0}
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.settings["host_rates"].get(host, self.settings["default_rate"])
+                self.buckets[host] = TokenBucket(rate, burst)
+            return self.buckets[host]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+        ceiling = min(self.settings["max_delay"], self.settings["backoff_base"] * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _count(self, key: str, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None,
+                retries: Optional[int] = None, deadline: Optional[float] = None,
+                **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures.
+
+        Returns the last response (which may still be an error status once
+        retries run out) or raises the last network exception; requests.Timeout
+        if the deadline passes before an attempt.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        retries = self.settings["retries"] if retries is None else retries
+        kwargs.setdefault("timeout", self.settings["timeout"])
+        timeout = kwargs["timeout"]
+        bucket = self.bucket(urlparse(url).netloc)
+
+        attempt = 0
+        while True:
+            self._count("rate_wait", bucket.acquire())
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise requests.Timeout(f"deadline passed before {method} {url}")
+                if isinstance(timeout, tuple):
+                    kwargs["timeout"] = tuple(min(t, remaining) for t in timeout)
+                else:
+                    kwargs["timeout"] = min(timeout, remaining)
+            self._count("requests")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A request that never reached the server is always safe to repeat
+                safe = idempotent or never_sent(e)
+                delay = self.backoff(attempt)
+                if attempt >= retries or not safe or (deadline is not None and time.monotonic() + delay >= deadline):
+                    raise
+            else:
+                status = response.status_code
+                if status not in RETRY_STATUSES or attempt >= retries or (not idempotent and status != 429):
+                    return response
+
+                retry_after = retry_after_seconds(response) if status in (429, 503) else None
+                if status == 429:
+                    self._count("throttled")
+                if retry_after is not None:
+                    delay = min(retry_after, self.settings["max_delay"])
+                else:
+                    delay = self.backoff(attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    return response
+                if retry_after is not None:
+                    bucket.pause(delay)
+                response.close()
+
+            self._count("retries")
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def configure(**settings) -> HttpClient:
+    """(Re)create the shared client with the given settings."""
+    global _client
+    with _client_lock:
+        _client = HttpClient(**settings)
+    return _client
+
+
+def get_client() -> HttpClient:
+    """Return the shared client, creating it with DEFAULTS on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return get_client().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return get_client().post(url, **kwargs)
@@ -0,0 +1,204 @@
+"""
+Newsletter Client - Waitlist API calls for weekly-newsletter.py
+
+Publishing an issue is three steps against {API_BASE}/api/{PROJECT_ID}/newsletter:
+
+  1. POST /issues               create the issue (draft)
+  2. POST /issues/{id}/send     queue it for delivery
+  3. GET  /issues/{id}          poll until delivery has finished
+
+Every request goes through the pooled http_client session with a
+(connect, read) timeout, and the whole publish has a deadline that also
+bounds retries, so a hung API fails the Monday job instead of stalling it.
+
+The POSTs are not retried blindly. The Waitlist /send delivers
+synchronously, so a send whose response was lost may already have mailed
+everyone: after a timeout or 5xx the issue status is fetched and the send is
+repeated only while the issue is still a draft. Creating an issue is retried
+only on 429 or when no connection was made (connect timeout, refused
+connection, DNS failure); a read timeout or 5xx fails the publish.
+Both still carry an Idempotency-Key derived from the issue content (the send
+uses "<key>:send") for servers that honour it.
+
+The API may answer /send synchronously ({"data": {"sent": N}}) or accept it
+for background delivery ({"data": {"status": "sending"}}); in the second case
+the issue is polled with growing intervals until it reports a final status.
+
+Usage:
+    client = NewsletterClient(API_BASE, PROJECT_ID)
+    result = client.publish(subject, html_content, text_content)
+    print(result["status"], result["recipients"])
+"""
+
+import hashlib
+import time
+from typing import Optional
+
+import http_client
+
+DEFAULTS = {
+    "connect_timeout": 5.0,
+    "read_timeout": 30.0,
+    "send_timeout": 60.0,    # read timeout for /send, which may deliver synchronously
+    "send_attempts": 3,      # /send attempts while the issue is still a draft
+    "deadline": 600.0,       # seconds for create + send + polling
+    "poll_interval": 2.0,    # first wait between status polls, doubled up to poll_max_interval
+    "poll_max_interval": 30.0
+}
+
+FINAL_STATES = {"sent", "failed", "cancelled"}
+
+
+def idempotency_key(subject: str, html_content: str, text_content: str = "") -> str:
+    """Key identifying an issue by its content, so retries map to the same issue."""
+    digest = hashlib.sha256()
+    for part in (subject, html_content, text_content or ""):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def _data(response) -> dict:
+    """The payload of a Waitlist response: {"data": {...}} or the body itself."""
+    try:
+        body = response.json()
+    except ValueError:
+        return {}
+    if not isinstance(body, dict):
+        return {}
+    data = body.get("data")
+    return {**body, **data} if isinstance(data, dict) else body
+
+
+class NewsletterClient:
+    """Creates, sends and tracks newsletter issues with timeouts and a deadline."""
+
+    def __init__(self, api_base: str, project_id: str,
+                 client: Optional[http_client.HttpClient] = None, **settings):
+        self.base = f"{api_base.rstrip('/')}/api/{project_id}/newsletter"
+        self.client = client or http_client.get_client()
+        self.settings = {**DEFAULTS, **settings}
+        self.timings = {}
+
+    def _timeout(self, read: Optional[float] = None):
+        return (self.settings["connect_timeout"], read or self.settings["read_timeout"])
+
+    def _timed(self, step: str, started: float):
+        self.timings[step] = round(self.timings.get(step, 0.0) + time.monotonic() - started, 3)
+
+    def next_issue_number(self, deadline: Optional[float] = None) -> int:
+        started = time.monotonic()
+        response = self.client.get(f"{self.base}/stats", timeout=self._timeout(), deadline=deadline)
+        self._timed("stats", started)
+        response.raise_for_status()
+        data = _data(response)
+        issues = data.get("issues") or {}
+        return int(issues.get("total_issues", data.get("total_issues", 0))) + 1
+
+    def create_issue(self, subject: str, html_content: str, text_content: str,
+                     key: str, deadline: Optional[float] = None) -> str:
+        started = time.monotonic()
+        response = self.client.post(
+            f"{self.base}/issues",
+            json={"subject": subject, "html_content": html_content, "text_content": text_content},
+            headers={"Content-Type": "application/json", "Idempotency-Key": key},
+            timeout=self._timeout(),
+            deadline=deadline
+        )
+        self._timed("create", started)
+        data = _data(response)
+        if not response.ok or not data.get("success", True):
+            raise RuntimeError(f"creating issue failed ({response.status_code}): {response.text[:200]}")
+        issue_id = (data.get("issue") or {}).get("id") or data.get("id")
+        if not issue_id:
+            raise RuntimeError(f"no issue id in response: {response.text[:200]}")
+        return str(issue_id)
+
+    def send_issue(self, issue_id: str, key: str, deadline: Optional[float] = None) -> dict:
+        """Send an issue at most once.
+
+        After a timeout, a dropped connection or a 5xx the send may still have
+        gone out, so the issue status decides: a draft is sent again, any
+        other status is returned as the result of the earlier attempt. If the
+        API has no status endpoint the error is raised instead of re-sending.
+        """
+        started = time.monotonic()
+        try:
+            for _ in range(max(1, self.settings["send_attempts"])):
+                try:
+                    response = self.client.post(
+                        f"{self.base}/issues/{issue_id}/send",
+                        headers={"Content-Type": "application/json", "Idempotency-Key": f"{key}:send"},
+                        timeout=self._timeout(self.settings["send_timeout"]),
+                        deadline=deadline
+                    )
+                except OSError as e:
+                    error = e
+                else:
+                    data = _data(response)
+                    if response.status_code < 500:
+                        if not response.ok or not data.get("success", True):
+                            raise RuntimeError(f"sending issue {issue_id} failed ({response.status_code}): {response.text[:200]}")
+                        return data
+                    error = RuntimeError(f"sending issue {issue_id} failed ({response.status_code}): {response.text[:200]}")
+
+                status = self.issue_status(issue_id, deadline)
+                if status is None:
+                    raise error
+                if status.get("status", "draft") != "draft":
+                    return status
+            raise error
+        finally:
+            self._timed("send", started)
+
+    def issue_status(self, issue_id: str, deadline: Optional[float] = None) -> Optional[dict]:
+        """Current state of an issue, or None if the API has no status endpoint."""
+        response = self.client.get(f"{self.base}/issues/{issue_id}", timeout=self._timeout(), deadline=deadline)
+        if response.status_code in (404, 405, 501):
+            return None
+        response.raise_for_status()
+        return _data(response)
+
+    def wait_until_sent(self, issue_id: str, deadline: float) -> dict:
+        """Poll the issue until it reaches a final state (or the deadline passes)."""
+        started = time.monotonic()
+        interval = self.settings["poll_interval"]
+        try:
+            while True:
+                status = self.issue_status(issue_id, deadline)
+                if status is None or status.get("status") in FINAL_STATES:
+                    return status or {}
+                wait = min(interval, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError(f"issue {issue_id} still '{status.get('status')}' at the deadline")
+                time.sleep(wait)
+                interval = min(interval * 2, self.settings["poll_max_interval"])
+        finally:
+            self._timed("poll", started)
+
+    def publish(self, subject: str, html_content: str, text_content: str) -> dict:
+        """Create, send and track one issue.
+
+        Returns {"issue_id", "status", "recipients", "timings"}; status is
+        "accepted" if the API cannot report delivery. Raises RuntimeError if
+        the API rejects a step and an OSError (requests.Timeout or
+        TimeoutError) once the deadline passes.
+        """
+        deadline = time.monotonic() + self.settings["deadline"]
+        key = idempotency_key(subject, html_content, text_content)
+
+        issue_id = self.create_issue(subject, html_content, text_content, key, deadline)
+        sent = self.send_issue(issue_id, key, deadline)
+        status = sent.get("status")
+        if status and status not in FINAL_STATES:
+            # Accepted for background delivery: wait for the final state
+            tracked = self.wait_until_sent(issue_id, deadline)
+            sent = {**sent, **tracked}
+            status = tracked.get("status") or "accepted"
+
+        return {
+            "issue_id": issue_id,
+            "status": status or "sent",
+            "recipients": sent.get("sent", sent.get("recipientCount", sent.get("total"))),
+            "timings": dict(self.timings)
+        }
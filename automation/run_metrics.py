@@ -0,0 +1,209 @@
+"""
+Run Metrics - lightweight stage timing and counters for the automation scripts
+
+A run records:
+
+  - stages: start offset, wall time and items in / out for each pipeline
+    step (nested stages are named "parent/child"), plus peak memory when
+    tracemalloc is running
+  - counters: bytes downloaded, LLM calls, tokens, ...
+  - caches: hits and misses per cache, reported with a hit rate
+
+report() turns this into a plain dict that main() dumps as the JSON run
+report, so successive runs can be compared when the feeds or the archive
+grow. profile() optionally wraps the run in cProfile (cpu) or tracemalloc
+(memory) and adds the top entries to the report.
+
+Usage:
+    metrics = RunMetrics("daily-update")
+    with metrics.stage("fetch") as stage:
+        tips = fetch()
+        stage["items_out"] = len(tips)
+    unique = metrics.stream("dedup", drop_duplicates, tips)  # generator stages
+    metrics.count("bytes_downloaded", 1234)
+    metrics.cache("validation", hits=3, misses=7)
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import tip_store
+
+
+class RunMetrics:
+    """Collects stage timings, counters and cache statistics for one run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.monotonic()
+        self.stages = []
+        self.counters = {}
+        self.caches = {}
+        self.profile_report = None
+        self.lock = threading.Lock()
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name: str, items_in: Optional[int] = None):
+        """Time a block; the yielded dict can be given items_out (or any extra key).
+
+        While tracemalloc is tracing, the stage's peak traced memory is
+        recorded as peak_bytes as well.
+        """
+        full_name = "/".join([frame["name"] for frame in self._stack] + [name])
+        started = time.monotonic()
+        record = {"name": full_name, "start": round(started - self.started, 3)}
+        if items_in is not None:
+            record["items_in"] = items_in
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        frame = {"name": name, "child_peak": 0}
+        self._stack.append(frame)
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.monotonic() - started, 3)
+            self._stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                # A nested stage resets the peak, so fold its peak back into ours
+                peak = max(tracemalloc.get_traced_memory()[1], frame["child_peak"])
+                record["peak_bytes"] = peak
+                if self._stack:
+                    self._stack[-1]["child_peak"] = max(self._stack[-1]["child_peak"], peak)
+            with self.lock:
+                self.stages.append(record)
+
+    def stream(self, name: str, stage: Callable, upstream: Optional[Iterable] = None) -> Iterator:
+        """Wrap a generator stage of a streaming pipeline.
+
+        stage(inputs) (or stage() when there is no upstream) must return an
+        iterator. Only the time spent inside the stage itself is counted:
+        time spent waiting on `upstream` is subtracted, so chained stages
+        add up instead of overlapping. items_in / items_out are counted and
+        the record is added when the stage is exhausted.
+        """
+        record = {"name": name, "start": round(time.monotonic() - self.started, 3), "seconds": 0.0}
+        return self._metered(record, stage, upstream)
+
+    def _metered(self, record: dict, stage: Callable, upstream: Optional[Iterable]) -> Iterator:
+        waiting = [0.0]
+
+        def inputs():
+            record["items_in"] = 0
+            iterator = iter(upstream)
+            while True:
+                started = time.monotonic()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    waiting[0] += time.monotonic() - started
+                record["items_in"] += 1
+                yield item
+
+        output = stage() if upstream is None else stage(inputs())
+        record["items_out"] = 0
+        spent = 0.0
+        while True:
+            started, waited = time.monotonic(), waiting[0]
+            try:
+                item = next(output)
+            except StopIteration:
+                break
+            finally:
+                spent += time.monotonic() - started - (waiting[0] - waited)
+            record["items_out"] += 1
+            yield item
+
+        record["seconds"] = round(spent, 3)
+        with self.lock:
+            self.stages.append(record)
+
+    def count(self, key: str, amount=1):
+        """Add to a named counter (thread-safe)."""
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def cache(self, name: str, hits: int = 0, misses: int = 0):
+        """Add hits / misses for a named cache (thread-safe)."""
+        with self.lock:
+            entry = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            entry["hits"] += hits
+            entry["misses"] += misses
+
+    def report(self) -> dict:
+        caches = {}
+        for name, entry in self.caches.items():
+            total = entry["hits"] + entry["misses"]
+            caches[name] = dict(entry, hit_rate=round(entry["hits"] / total, 3) if total else None)
+
+        report = {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": round(time.monotonic() - self.started, 3),
+            "stages": sorted(self.stages, key=lambda s: s["start"]),
+            "counters": dict(self.counters),
+            "caches": caches
+        }
+        if self.profile_report:
+            report["profile"] = self.profile_report
+        return report
+
+    def write(self, path: Path) -> dict:
+        """Write the JSON report (atomically) and return it."""
+        report = self.report()
+        path = Path(path)
+        if path.exists() and not path.is_file():
+            # e.g. /dev/stdout or /dev/null: write through, never rename over it
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+            return report
+        tip_store.write_json_atomic(path, report, indent=2)
+        return report
+
+    @contextmanager
+    def profile(self, mode: Optional[str], top: int = 15):
+        """Run the block under cProfile ("cpu") or tracemalloc ("memory").
+
+        The top entries end up in report()["profile"]; mode None does nothing.
+        """
+        if mode == "cpu":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+                self.profile_report = {"mode": "cpu", "top": out.getvalue().splitlines()}
+        elif mode == "memory":
+            tracemalloc.start()
+            try:
+                yield
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                # Stages reset the peak, so the run's peak is the largest seen by any of them
+                peak = max([peak] + [stage.get("peak_bytes", 0) for stage in self.stages])
+                self.profile_report = {
+                    "mode": "memory",
+                    "current_bytes": current,
+                    "peak_bytes": peak,
+                    "top": [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+                }
+        else:
+            yield
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Search Index - BM25 full-text search over tips/categories/*.md
+
+Titles and bodies of every tip are tokenized (tip_store.tokenize) into an
+inverted index (term -> postings of tip number and term frequency, title
+terms counted twice) and ranked with Okapi BM25. The index lives in .cache/search-index.bin and is
+kept in sync with the tip store: new tips are tokenized and appended, and
+only an edited or removed tip triggers a full rebuild. daily-update.py
+refreshes it after every commit that adds tips.
+
+File format:
+
+  b"CCSI" + version byte
+  4-byte big-endian header length, then a JSON header:
+      {"docs": [[number, category, title, length, tip hash, text hash], ...],
+       "terms": {term: [document frequency, offset, size], ...},
+       "total_length": N}
+  postings blob: for each term, (tip number delta, term frequency) pairs in
+  ascending tip number order, as LEB128 varints
+
+Loading parses only the header; a query decodes the postings of its own
+terms, so lookups stay in the millisecond range as the archive grows.
+
+Usage:
+    python automation/search_index.py "worktree parallel agents"
+    python automation/search_index.py "hooks" --category tooling --limit 5
+    python automation/search_index.py --rebuild
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import struct
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import tip_store
+
+MAGIC = b"CCSI"
+VERSION = 1
+TITLE_WEIGHT = 2
+K1 = 1.2
+B = 0.75
+
+
+def _encode(postings: Dict[int, int]) -> bytes:
+    out = bytearray()
+    previous = 0
+    for number in sorted(postings):
+        for value in (number - previous, postings[number]):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        previous = number
+    return bytes(out)
+
+
+def _decode(data: bytes) -> Dict[int, int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    postings = {}
+    number = 0
+    for i in range(0, len(values), 2):
+        number += values[i]
+        postings[number] = values[i + 1]
+    return postings
+
+
+def default_index_path(repo_root: Path) -> Path:
+    return Path(repo_root) / ".cache" / "search-index.bin"
+
+
+class SearchIndex:
+    """Inverted index over the tip archive with BM25 ranking."""
+
+    def __init__(self):
+        self.docs: Dict[int, list] = {}     # number -> [number, category, title, length, hash, text hash]
+        self.terms: Dict[str, list] = {}    # term -> [df, offset, size] into blob
+        self.blob = b""
+        self.total_length = 0
+        self._decoded: Dict[str, Dict[int, int]] = {}  # postings decoded or changed since load
+        self._dirty = set()
+        self._docs_changed = False
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SearchIndex"]:
+        """Read an index file; None if it is missing or from another version."""
+        try:
+            data = Path(path).read_bytes()
+            if data[:4] != MAGIC or data[4] != VERSION:
+                return None
+            (header_length,) = struct.unpack(">I", data[5:9])
+            header = json.loads(data[9:9 + header_length])
+        except (OSError, ValueError, IndexError, struct.error):
+            return None
+        index = cls()
+        index.docs = {doc[0]: doc for doc in header["docs"]}
+        index.terms = header["terms"]
+        index.total_length = header["total_length"]
+        index.blob = data[9 + header_length:]
+        return index
+
+    def save(self, path: Path):
+        """Write the index atomically; unchanged postings are copied as bytes."""
+        blob = bytearray()
+        terms = {}
+        for term in sorted(set(self.terms) | self._dirty):
+            if term in self._dirty:
+                postings = self._decoded.get(term) or {}
+                if not postings:
+                    continue
+                encoded = _encode(postings)
+                df = len(postings)
+            else:
+                df, offset, size = self.terms[term]
+                encoded = self.blob[offset:offset + size]
+            terms[term] = [df, len(blob), len(encoded)]
+            blob += encoded
+
+        header = json.dumps({
+            "docs": sorted(self.docs.values()),
+            "terms": terms,
+            "total_length": self.total_length
+        }, separators=(",", ":")).encode()
+
+        tip_store.write_atomic(path, MAGIC + bytes([VERSION]) + struct.pack(">I", len(header)) + header + blob)
+
+        self.terms, self.blob = terms, bytes(blob)
+        self._decoded, self._dirty = {}, set()
+        self._docs_changed = False
+
+    def postings(self, term: str) -> Dict[int, int]:
+        """Tip number -> term frequency for one term (decoded on first use)."""
+        if term not in self._decoded:
+            entry = self.terms.get(term)
+            self._decoded[term] = _decode(self.blob[entry[1]:entry[1] + entry[2]]) if entry else {}
+        return self._decoded[term]
+
+    def add(self, record: dict, body: str):
+        """Index one tip (record from tip_store, body from load_bodies)."""
+        text = tip_store.tip_text(body)
+        counts = Counter(tip_store.tokenize(text))
+        for token in tip_store.tokenize(record["title"]):
+            counts[token] += TITLE_WEIGHT
+        for term, frequency in counts.items():
+            self.postings(term)[record["number"]] = frequency
+            self._dirty.add(term)
+
+        length = sum(counts.values())
+        text_hash = hashlib.sha1((record["title"] + "\n" + text).encode()).hexdigest()[:12]
+        self.docs[record["number"]] = [record["number"], record["category"], record["title"],
+                                       length, record["hash"], text_hash]
+        self.total_length += length
+        self._docs_changed = True
+
+    def sync(self, records: List[dict], repo_root: Path = Path(".")) -> Dict[str, int]:
+        """Bring the index in line with the tip store records.
+
+        New tips are tokenized and appended. A tip whose bytes changed but
+        whose text did not (e.g. the separator before a newly appended tip)
+        only has its hash updated. An edited or removed tip rebuilds the index.
+        Returns counts of added / updated tips and whether it was rebuilt.
+        """
+        current = {record["number"]: record for record in records}
+        removed = [number for number in self.docs if number not in current]
+        changed = [r for r in records if r["number"] in self.docs and self.docs[r["number"]][4] != r["hash"]]
+        added = [r for r in records if r["number"] not in self.docs]
+        if not (removed or changed or added):
+            return {"added": 0, "updated": 0, "rebuilt": 0}
+
+        # Copies, so body text is not left on the caller's records
+        pending = [dict(record) for record in changed + added]
+        tip_store.load_bodies(pending, repo_root)
+
+        rebuild = bool(removed)
+        updated = 0
+        for record in pending[:len(changed)]:
+            doc = self.docs[record["number"]]
+            text = tip_store.tip_text(record["body"])
+            if hashlib.sha1((record["title"] + "\n" + text).encode()).hexdigest()[:12] != doc[5]:
+                rebuild = True
+                break
+            doc[1], doc[4] = record["category"], record["hash"]
+            updated += 1
+
+        if rebuild:
+            self.__init__()
+            for record in tip_store.load_bodies([dict(record) for record in records], repo_root):
+                self.add(record, record["body"])
+            return {"added": len(records), "updated": 0, "rebuilt": 1}
+
+        for record in pending[len(changed):]:
+            self.add(record, record["body"])
+        self._docs_changed = self._docs_changed or bool(updated)
+        return {"added": len(added), "updated": updated, "rebuilt": 0}
+
+    @property
+    def changed(self) -> bool:
+        return self._docs_changed or bool(self._dirty)
+
+    def search(self, query: str, limit: int = 10, category: Optional[str] = None) -> List[dict]:
+        """Rank tips for a query with BM25; returns number, title, category, score."""
+        count = len(self.docs)
+        if not count:
+            return []
+        average_length = self.total_length / count
+        scores: Dict[int, float] = {}
+        for term in set(tip_store.tokenize(query)):
+            postings = self.postings(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for number, frequency in postings.items():
+                length = self.docs[number][3]
+                norm = frequency + K1 * (1 - B + B * length / average_length)
+                scores[number] = scores.get(number, 0.0) + idf * frequency * (K1 + 1) / norm
+
+        ranked = sorted(
+            (number for number in scores if category is None or self.docs[number][1] == category),
+            key=lambda number: (-scores[number], number)
+        )
+        return [
+            {
+                "number": number,
+                "title": self.docs[number][2],
+                "category": self.docs[number][1],
+                "score": round(scores[number], 3)
+            }
+            for number in ranked[:limit]
+        ]
+
+
+def open_index(repo_root: Path = Path("."), path: Optional[Path] = None,
+               records: Optional[Iterable[dict]] = None, stats: Optional[dict] = None) -> SearchIndex:
+    """Load the index, sync it with the tip store and save it if anything changed.
+
+    records defaults to tip_store.load_records(repo_root); stats, if given,
+    receives the counts from SearchIndex.sync.
+    """
+    repo_root = Path(repo_root)
+    path = Path(path) if path else default_index_path(repo_root)
+    index = SearchIndex.load(path) or SearchIndex()
+    records = list(records) if records is not None else tip_store.load_records(repo_root)
+    result = index.sync(records, repo_root)
+    if stats is not None:
+        stats.update(result)
+    if index.changed:
+        index.save(path)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the Claude Code Daily tip archive.")
+    parser.add_argument("query", nargs="?", default="", help="words to search for")
+    parser.add_argument("--limit", type=int, default=10, help="number of results")
+    parser.add_argument("--category", help="only return tips from this category")
+    parser.add_argument("--repo", default=str(Path(__file__).resolve().parent.parent), help="repository root")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index from scratch")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.repo)
+    path = default_index_path(repo_root)
+    if args.rebuild:
+        path.unlink(missing_ok=True)
+
+    started = time.monotonic()
+    stats = {}
+    index = open_index(repo_root, path, stats=stats)
+    opened = time.monotonic()
+    results = index.search(args.query, args.limit, args.category) if args.query else []
+    searched = time.monotonic()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    if stats.get("added") or stats.get("updated"):
+        rebuilt = " (rebuilt)" if stats["rebuilt"] else ""
+        print(f"🔎 Index: {stats['added']} tips added, {stats['updated']} updated{rebuilt}", file=sys.stderr)
+    print(f"🔎 {len(index.docs)} tips, {len(index.terms)} terms "
+          f"(open {(opened - started) * 1000:.1f}ms, query {(searched - opened) * 1000:.1f}ms)", file=sys.stderr)
+    for result in results:
+        print(f"  #{result['number']:<5} {result['score']:>6.2f}  [{result['category']}] {result['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Tip Store - shared, cached index of the tips in tips/categories/*.md
+
+Both daily-update.py and weekly-newsletter.py need the list of tips in the
+archive. Instead of each script re-scanning the markdown with its own
+parser, every category file is parsed once into compact records:
+
+  {"number": 42, "title": "...", "category": "workflow", "source": "...",
+   "url": "https://...", "file": "tips/categories/workflow.md",
+   "start": 1234, "body_start": 1260, "end": 1710, "hash": "3f2a..."}
+
+Offsets are byte offsets into the file: `start` is the "## N. Title"
+header, `body_start` the line after it and `end` the start of the next tip
+(or the category footer). `hash` covers the bytes start..end. Records are
+cached in .cache/tip-store.json and a file is only re-parsed when its mtime
+or size changes.
+
+tips/index.json is derived from these records (see build_index), so other
+consumers can seek straight to a tip without parsing the markdown:
+records_from_index turns it back into header-only records and
+load_bodies(verify=True) reads just those tips, checking each hash.
+
+tip_text, words and tokenize are the one normalization of tip text that
+deduplication, categorization and search all share; write_atomic and
+write_json_atomic are the one way the automation scripts write state and
+cache files.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+CACHE_VERSION = 2
+TIP_HEADER = re.compile(rb'^## (\d+)\. (.+?)\s*$')
+ORIGINAL_LINK = re.compile(rb'^\[Original\]\(([^)\s]+)\)')
+SOURCE_PREFIX = b"**Source:**"
+FOOTER_MARKER = b"*[Back to Categories]"
+
+# Markdown scaffolding of a tip entry that is not part of its text
+SCAFFOLD_PREFIXES = ("**Source:**", "[Original]", "---", "*[Back to")
+WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an the and or for with you your that this from are was were have has not "
+    "but can use using into when what how its it is in of on to be by as at if "
+    "will all out more just than then them they their one get got our any each "
+    "also like only very so do does".split()
+)
+
+# Positional layout of a record inside the cache file (keeps it compact)
+_FIELDS = ("number", "title", "source", "url", "start", "body_start", "end", "hash")
+
+
+def write_atomic(path: Path, data: Union[str, bytes]):
+    """Write a file via a temp file and os.replace, so a crash never truncates it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_json_atomic(path: Path, data, indent: Optional[int] = None, optional: bool = False) -> bool:
+    """write_atomic for JSON: compact, or indented with a trailing newline.
+
+    optional=True is for caches, which are only an optimisation: an OSError
+    is swallowed and False returned instead of failing the caller.
+    """
+    if indent is None:
+        text = json.dumps(data, separators=(",", ":"))
+    else:
+        text = json.dumps(data, indent=indent) + "\n"
+    try:
+        write_atomic(path, text)
+    except OSError:
+        if not optional:
+            raise
+        return False
+    return True
+
+
+def tip_text(body: str) -> str:
+    """A tip body without its markdown scaffolding or surrounding blank lines."""
+    return "\n".join(line for line in body.splitlines() if not line.startswith(SCAFFOLD_PREFIXES)).strip()
+
+
+def words(text: str) -> List[str]:
+    """Lower-cased words of a text; "+" and "#" are kept inside words (c++, c#)."""
+    return WORD.findall(text.lower())
+
+
+def tokenize(text: str) -> List[str]:
+    """Words without stopwords, plural "s" stripped: the terms tips are indexed by."""
+    tokens = []
+    for token in words(text):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def parse_category_bytes(data: bytes) -> List[dict]:
+    """Parse one category file in a single pass over its lines.
+
+    Only numbered "## N. Title" headers start a tip, so plain "## Heading"
+    lines inside markdown examples stay part of the tip body.
+    """
+    records = []
+    current = None
+    offset = 0
+
+    for line in data.splitlines(keepends=True):
+        line_start = offset
+        offset += len(line)
+
+        match = TIP_HEADER.match(line)
+        if match:
+            if current:
+                current["end"] = line_start
+                records.append(current)
+            current = {
+                "number": int(match.group(1)),
+                "title": match.group(2).decode("utf-8", "replace").strip(),
+                "source": "",
+                "url": "",
+                "start": line_start,
+                "body_start": offset,
+                "end": len(data)
+            }
+        elif current is None:
+            continue
+        elif line.startswith(FOOTER_MARKER):
+            current["end"] = line_start
+            records.append(current)
+            current = None
+        elif not current["source"] and line.startswith(SOURCE_PREFIX):
+            current["source"] = line[len(SOURCE_PREFIX):].decode("utf-8", "replace").strip()
+        elif not current["url"]:
+            link = ORIGINAL_LINK.match(line)
+            if link:
+                current["url"] = link.group(1).decode("utf-8", "replace")
+
+    if current:
+        records.append(current)
+
+    for record in records:
+        record["hash"] = hashlib.sha1(data[record["start"]:record["end"]]).hexdigest()[:12]
+    return records
+
+
+def parse_category(data: bytes, category: str) -> List[dict]:
+    """Parse a category file's bytes into full records (with category and file)."""
+    return _unpack(_pack(parse_category_bytes(data)), category, f"tips/categories/{category}.md")
+
+
+def _pack(records: List[dict]) -> List[list]:
+    return [[r[field] for field in _FIELDS] for r in records]
+
+
+def _unpack(rows: List[list], category: str, file: str) -> List[dict]:
+    records = []
+    for row in rows:
+        record = dict(zip(_FIELDS, row))
+        record["category"] = category
+        record["file"] = file
+        records.append(record)
+    return records
+
+
+def default_cache_path(repo_root: Path) -> Path:
+    return Path(repo_root) / ".cache" / "tip-store.json"
+
+
+def load_records(repo_root: Path = Path("."), categories: Optional[Iterable[str]] = None,
+                 cache_path: Optional[Path] = None, stats: Optional[dict] = None) -> List[dict]:
+    """Return records for every tip in tips/categories, using the cache when fresh.
+
+    categories limits (and orders) the files that are read; by default all
+    *.md files are read in sorted order. If given, stats["cached"] and
+    stats["parsed"] are incremented per file.
+    """
+    repo_root = Path(repo_root)
+    tips_dir = repo_root / "tips" / "categories"
+    cache_path = cache_path or default_cache_path(repo_root)
+
+    if categories is None:
+        categories = sorted(p.stem for p in tips_dir.glob("*.md"))
+
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+        if cache.get("version") != CACHE_VERSION:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    files = cache.get("files", {})
+
+    records = []
+    changed = False
+    for category in categories:
+        path = tips_dir / f"{category}.md"
+        rel_path = f"tips/categories/{category}.md"
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+
+        entry = files.get(rel_path)
+        if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            # New or changed file: re-parse it, every other file comes from the cache
+            entry = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "tips": _pack(parse_category_bytes(path.read_bytes()))
+            }
+            files[rel_path] = entry
+            changed = True
+            if stats is not None:
+                stats["parsed"] = stats.get("parsed", 0) + 1
+        elif stats is not None:
+            stats["cached"] = stats.get("cached", 0) + 1
+
+        records.extend(_unpack(entry["tips"], category, rel_path))
+
+    if changed:
+        write_json_atomic(cache_path, {"version": CACHE_VERSION, "files": files}, optional=True)
+
+    return records
+
+
+def records_from_index(index: dict) -> List[dict]:
+    """Header-only records (number, title, category, byte range, hash) from a
+    tips/index.json document, without touching the markdown.
+
+    The index has no body_start, source or url; load_bodies skips the header
+    line itself and verify=True catches an index that is out of date.
+    """
+    files = {c.get("slug"): c.get("file") for c in index.get("categories", [])}
+    return [
+        {
+            "number": tip["number"],
+            "title": tip["title"],
+            "category": tip["category"],
+            "file": files.get(tip["category"]) or f"tips/categories/{tip['category']}.md",
+            "start": tip["offset"],
+            "body_start": None,
+            "end": tip["offset"] + tip["length"],
+            "hash": tip["hash"]
+        }
+        for tip in index.get("tips", [])
+    ]
+
+
+def load_bodies(records: List[dict], repo_root: Path = Path("."), verify: bool = False) -> List[dict]:
+    """Fill in record["body"] (text between the header and the next tip).
+
+    Each category file is opened once and memory-mapped, so only the pages
+    holding the requested tips are read. With verify=True the bytes of each
+    tip are checked against record["hash"] and ValueError is raised if the
+    file changed after the records were built.
+    """
+    by_file = {}
+    for record in records:
+        by_file.setdefault(record["file"], []).append(record)
+
+    for file, file_records in by_file.items():
+        with open(Path(repo_root) / file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b""  # mmap refuses empty files
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for record in file_records:
+                    chunk = data[record["start"]:record["end"]]
+                    if verify and hashlib.sha1(chunk).hexdigest()[:12] != record["hash"]:
+                        raise ValueError(f"{file}: tip {record['number']} changed since it was indexed")
+                    if record.get("body_start") is not None:
+                        skip = record["body_start"] - record["start"]
+                    else:
+                        skip = chunk.find(b"\n") + 1 or len(chunk)
+                    record["body"] = chunk[skip:].decode("utf-8", "replace")
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+    return records
+
+
+def build_index(records: List[dict], previous: Optional[dict] = None) -> dict:
+    """Derive the tips/index.json document from tip records.
+
+    Counts, totals and the per-tip table are recomputed from the records,
+    while hand-maintained fields (category names/icons, sources) are kept
+    from the previous index.
+    """
+    index = dict(previous or {})
+    known = {c.get("slug", c.get("name", "")).lower(): c for c in index.get("categories", [])}
+
+    by_category = {}
+    for record in records:
+        by_category.setdefault(record["category"], []).append(record)
+
+    categories = []
+    for slug in list(known) + [c for c in by_category if c not in known]:
+        category_records = by_category.get(slug, [])
+        entry = dict(known.get(slug) or {
+            "name": slug.replace("-", " ").title(),
+            "slug": slug,
+            "icon": "\U0001f4a1"
+        })
+        entry["count"] = len(category_records)
+        entry["file"] = f"tips/categories/{slug}.md"
+        entry["highestTip"] = max((r["number"] for r in category_records), default=0)
+        categories.append(entry)
+
+    index.setdefault("version", "1.0.0")
+    index["totalTips"] = len(records)
+    index["highestTip"] = max((r["number"] for r in records), default=0)
+    index["categories"] = categories
+    index["tips"] = [
+        {
+            "number": r["number"],
+            "title": r["title"],
+            "category": r["category"],
+            "offset": r["start"],
+            "length": r["end"] - r["start"],
+            "hash": r["hash"]
+        }
+        for r in sorted(records, key=lambda r: r["number"])
+    ]
+    return index
+
+
+def dump_index(index: dict) -> str:
+    """Serialize the index like json.dump(indent=2), but one line per tip."""
+    index = dict(index)
+    tips = index.pop("tips", [])
+    text = json.dumps(index, indent=2)
+    rows = ",\n".join("    " + json.dumps(tip) for tip in tips)
+    return text[:-2] + ',\n  "tips": [\n' + rows + "\n  ]\n}"
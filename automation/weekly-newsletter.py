@@ -3,9 +3,10 @@
 Weekly Newsletter Generator for Claude Code Daily
 
 Runs every Monday to:
-1. Select best tips from the pool
+1. Select best tips from the pool (skipping tips sent in recent issues)
 2. Generate newsletter HTML
 3. Send via Waitlist API to all subscribers
+4. Record the issue in automation/sent-history.json
 
 Environment Variables:
 - WAITLIST_API_URL: API base URL (default: https://waitlist.neurabytelabs.com)
@@ -17,15 +18,23 @@ import os
 import sys
 import json
 import random
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from html import escape as html_escape
 from pathlib import Path
 
+import email_render
+import newsletter_client
+import tip_store
+
 # Configuration
 API_BASE = os.environ.get('WAITLIST_API_URL', 'https://waitlist.neurabytelabs.com')
 PROJECT_ID = os.environ.get('WAITLIST_PROJECT_ID', 'claudecodedaily')
 TIPS_PER_NEWSLETTER = 8  # 8 is our lucky number!
+REPEAT_WINDOW_DAYS = 182  # a tip is not sent again for about six months
 REPO_ROOT = Path(__file__).parent.parent
+HISTORY_FILE = 'automation/sent-history.json'  # relative to REPO_ROOT
+DRAFT_FILE = 'automation/draft.json'
+HISTORY_VERSION = 1
 
 # Category icons
 CATEGORY_ICONS = {
@@ -38,93 +47,190 @@ CATEGORY_ICONS = {
 
 
 def load_tips():
-    """Load all tips from markdown files."""
-    tips = []
-    categories_dir = REPO_ROOT / 'tips' / 'categories'
-
-    for md_file in categories_dir.glob('*.md'):
-        category = md_file.stem
-        content = md_file.read_text()
-
-        # Parse tips from markdown (split by ## headers)
-        current_tip = None
-        lines = content.split('\n')
-
-        for line in lines:
-            if line.startswith('## '):
-                if current_tip:
-                    tips.append(current_tip)
-                # Extract tip number and title
-                title = line[3:].strip()
-                current_tip = {
-                    'category': category,
-                    'title': title,
-                    'content': '',
-                    'icon': CATEGORY_ICONS.get(category, '💡')
-                }
-            elif current_tip:
-                current_tip['content'] += line + '\n'
-
-        if current_tip:
-            tips.append(current_tip)
+    """Load the header index of every tip: category, number, title and byte range.
 
+    Read from tips/index.json (rewritten by every daily run) when it exists,
+    otherwise from the shared tip store. Bodies are not loaded here; call
+    load_contents() for the tips that end up in the issue.
+    """
+    try:
+        with open(REPO_ROOT / 'tips' / 'index.json') as f:
+            records = tip_store.records_from_index(json.load(f))
+    except (OSError, ValueError, KeyError):
+        records = []
+    if not records:
+        records = tip_store.load_records(REPO_ROOT)
+
+    return [
+        {
+            'category': record['category'],
+            'number': record['number'],
+            'title': f"{record['number']}. {record['title']}",
+            'icon': CATEGORY_ICONS.get(record['category'], '💡'),
+            'record': record
+        }
+        for record in records
+    ]
+
+
+def load_contents(tips):
+    """Read tip['content'] for the given tips only, seeking to their byte ranges.
+
+    If the markdown changed since tips/index.json was written, the tips are
+    looked up again in the tip store (which re-parses changed files).
+    """
+    records = [tip['record'] for tip in tips]
+    try:
+        tip_store.load_bodies(records, REPO_ROOT, verify=True)
+    except (OSError, ValueError) as e:
+        print(f'Warning: tips/index.json is out of date ({e}), using the tip store')
+        current = {(r['category'], r['number']): r for r in tip_store.load_records(REPO_ROOT)}
+        records = [current.get((tip['category'], tip['number'])) for tip in tips]
+        tips = [tip for tip, record in zip(tips, records) if record]
+        records = tip_store.load_bodies([record for record in records if record], REPO_ROOT)
+
+    for tip, record in zip(tips, records):
+        tip['record'] = record
+        tip['content'] = record['body']
     return tips
 
 
-def select_tips(tips, count=TIPS_PER_NEWSLETTER):
-    """Select tips ensuring category diversity."""
+def load_history(tips):
+    """Load the sent-history index: when each tip number was last sent, plus
+    the list of issues.
+
+    On first use it is seeded from automation/draft.json (the last issue
+    saved by the CLI dashboard), whose tips are matched to archive numbers
+    by category and title.
+    """
+    try:
+        with open(REPO_ROOT / HISTORY_FILE) as f:
+            history = json.load(f)
+        if history.get('version') == HISTORY_VERSION:
+            return history
+    except (OSError, ValueError):
+        pass
+
+    history = {'version': HISTORY_VERSION, 'last_sent': {}, 'issues': []}
+    try:
+        with open(REPO_ROOT / DRAFT_FILE) as f:
+            draft = json.load(f)
+    except (OSError, ValueError):
+        return history
+
+    by_title = {(tip['category'], tip['record']['title'].lower()): tip for tip in tips}
+    sent = [by_title.get((t.get('category'), t.get('title', '').lower())) for t in draft.get('tips', [])]
+    sent = [tip for tip in sent if tip]
+    if sent and draft.get('created_at'):
+        record_issue(history, draft.get('issue_number'), sent, draft['created_at'])
+    return history
+
+
+def record_issue(history, issue_number, tips, sent_at=None):
+    """Add an issue to the history and update each tip's last-sent date."""
+    sent_at = sent_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    numbers = [tip['number'] for tip in tips]
+    history['issues'].append({'issue': issue_number, 'sent_at': sent_at, 'tips': numbers})
+    for number in numbers:
+        history['last_sent'][str(number)] = sent_at
+    return history
+
+
+def save_history(history):
+    """Write the history file atomically (it is committed by the workflow)."""
+    tip_store.write_json_atomic(REPO_ROOT / HISTORY_FILE, history, indent=2)
+
+
+def recently_sent(history, now=None, window_days=REPEAT_WINDOW_DAYS):
+    """Tip numbers sent within the window, mapped to when they were sent."""
+    if not history:
+        return {}
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=window_days)
+    recent = {}
+    for number, sent_at in history.get('last_sent', {}).items():
+        when = datetime.fromisoformat(sent_at)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        if when >= cutoff:
+            recent[int(number)] = when
+    return recent
+
+
+def select_tips(tips, count=TIPS_PER_NEWSLETTER, history=None, now=None):
+    """Select tips ensuring category diversity, skipping recently sent ones.
+
+    Tips sent within REPEAT_WINDOW_DAYS are left out of the per-category
+    pools. Each pick swaps a random tip to the end of its pool and pops it,
+    so selection is O(count) once the pools are built. If too few fresh tips
+    remain, the least recently sent ones fill the issue.
+    """
+    recent = recently_sent(history, now)
+
     # Group by category
-    by_category = {}
+    pools = {}
+    held_back = []
     for tip in tips:
-        cat = tip['category']
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(tip)
+        if tip['number'] in recent:
+            held_back.append(tip)
+        else:
+            pools.setdefault(tip['category'], []).append(tip)
 
     selected = []
-    categories = list(by_category.keys())
+    categories = list(pools.keys())
     random.shuffle(categories)
 
     # Round-robin selection from each category
     cat_index = 0
-    while len(selected) < count and any(by_category.values()):
+    while len(selected) < count and categories:
         cat = categories[cat_index % len(categories)]
-        if by_category[cat]:
-            tip = random.choice(by_category[cat])
-            by_category[cat].remove(tip)
-            selected.append(tip)
-        cat_index += 1
+        pool = pools[cat]
+        pick = random.randrange(len(pool))
+        pool[pick], pool[-1] = pool[-1], pool[pick]
+        selected.append(pool.pop())
+        if pool:
+            cat_index += 1
+        else:
+            categories.remove(cat)  # the next category moves into this slot
+
+    if len(selected) < count and held_back:
+        held_back.sort(key=lambda tip: recent[tip['number']])
+        selected.extend(held_back[:count - len(selected)])
 
     return selected
 
 
+_fragments = None
+
+
+def fragment_cache():
+    """Rendered tip fragments, cached in .cache/ by content hash across runs."""
+    global _fragments
+    if _fragments is None:
+        _fragments = email_render.FragmentCache(REPO_ROOT / '.cache' / 'newsletter-fragments.json')
+    return _fragments
+
+
+def split_source(content):
+    """Split the "**Source:** name" line off a tip body: (source, rest)."""
+    lines = content.strip().split('\n')
+    for i, line in enumerate(lines):
+        if line.startswith('**Source:**'):
+            return line.replace('**Source:**', '').strip(), '\n'.join(lines[:i] + lines[i + 1:]).strip()
+    return 'Community', content.strip()
+
+
 def generate_html(tips, issue_number):
     """Generate CLI-style newsletter HTML from selected tips."""
     date_str = datetime.now().strftime('%Y-%m-%d')
-
-    # Extract source from content if present
-    def get_source(content):
-        for line in content.split('\n'):
-            if line.startswith('**Source:**'):
-                return line.replace('**Source:**', '').strip()
-        return 'Community'
+    fragments = fragment_cache()
 
     cases_html = ''
     for i, tip in enumerate(tips, 1):
-        content = tip['content'].strip()
-        source = get_source(content)
-
-        # Clean content - convert markdown to HTML-ish
-        display_content = content
-        display_content = display_content.replace('**Source:**', '// source:')
-        display_content = display_content.replace('**Why it works:**', '<br><br><strong style="color:#06b6d4;">Why it works:</strong>')
-        display_content = display_content.replace('**', '')
-        display_content = display_content.replace('\n\n', '</p><p style="margin: 8px 0; color: #a1a1aa;">')
-        display_content = display_content.replace('\n', '<br>')
-        display_content = display_content.replace('```bash', '<pre style="background: #000; padding: 12px; border-radius: 4px; overflow-x: auto; margin: 12px 0; color: #22c55e;">')
-        display_content = display_content.replace('```markdown', '<pre style="background: #000; padding: 12px; border-radius: 4px; overflow-x: auto; margin: 12px 0; color: #a1a1aa;">')
-        display_content = display_content.replace('```json', '<pre style="background: #000; padding: 12px; border-radius: 4px; overflow-x: auto; margin: 12px 0; color: #fbbf24;">')
-        display_content = display_content.replace('```', '</pre>')
+        source, body = split_source(tip['content'])
+        display_content = fragments.get('html', body)
+        title = html_escape(tip['title'])
+        source = html_escape(source)
 
         cases_html += f'''
     <div style="margin-bottom: 24px; font-family: 'SF Mono', 'Fira Code', ui-monospace, monospace;">
@@ -135,7 +241,7 @@ def generate_html(tips, issue_number):
       </div>
       <div style="background: #0a0a0a; padding: 16px; border-radius: 0 0 8px 8px;">
         <div style="color: #fafafa; font-size: 14px; font-weight: 600; margin-bottom: 8px;">
-          {tip['icon']} {tip['title']}
+          {tip['icon']} {title}
         </div>
         <div style="color: #71717a; font-size: 11px; margin-bottom: 12px;">
           // source: {source}
@@ -204,58 +310,62 @@ def generate_html(tips, issue_number):
     return html
 
 
+def generate_text(tips, issue_number):
+    """Generate the plain-text part of the newsletter from selected tips."""
+    date_str = datetime.now().strftime('%Y-%m-%d')
+    fragments = fragment_cache()
+
+    parts = [
+        f'Claude Code Daily #{issue_number}',
+        f'{date_str} - {len(tips)} real use cases',
+        f"This week's collection: {len(tips)} real use cases from developers "
+        f"who've cracked the code on Claude Code workflows. Each one tested in production."
+    ]
+    for i, tip in enumerate(tips, 1):
+        source, body = split_source(tip['content'])
+        parts.append(f"{'-' * 40}\n{i}. {tip['icon']} {tip['title']}\n// source: {source}\n\n"
+                     + fragments.get('text', body))
+    parts.append(f"{'-' * 40}\nCurated from Reddit & the Claude Code community.\n"
+                 f"Unsubscribe: {{{{unsubscribe_url}}}}")
+    return '\n\n'.join(parts) + '\n'
+
+
+_api = None
+
+
+def api_client():
+    """Shared Waitlist API client (pooled session, timeouts, publish deadline)."""
+    global _api
+    if _api is None:
+        _api = newsletter_client.NewsletterClient(API_BASE, PROJECT_ID)
+    return _api
+
+
 def get_next_issue_number():
     """Get the next issue number from the API."""
     try:
-        response = requests.get(f'{API_BASE}/api/{PROJECT_ID}/newsletter/stats')
-        if response.ok:
-            data = response.json()
-            if data.get('success') and data.get('data'):
-                total = data['data'].get('issues', {}).get('total_issues', 0)
-                return int(total) + 1
-    except Exception as e:
+        return api_client().next_issue_number()
+    except (RuntimeError, OSError, ValueError) as e:
         print(f'Warning: Could not get issue count: {e}')
     return 1
 
 
-def create_and_send_issue(subject, html_content):
-    """Create a newsletter issue and send it."""
-    # Create draft
-    create_response = requests.post(
-        f'{API_BASE}/api/{PROJECT_ID}/newsletter/issues',
-        json={
-            'subject': subject,
-            'html_content': html_content,
-            'text_content': f'View this email in your browser for the best experience.'
-        },
-        headers={'Content-Type': 'application/json'}
-    )
-
-    if not create_response.ok:
-        print(f'Error creating issue: {create_response.text}')
-        return False
-
-    result = create_response.json()
-    if not result.get('success'):
-        print(f'Error: {result}')
+def create_and_send_issue(subject, html_content, text_content=None):
+    """Create a newsletter issue, send it and wait for delivery to finish."""
+    try:
+        result = api_client().publish(
+            subject, html_content,
+            text_content or 'View this email in your browser for the best experience.'
+        )
+    except (RuntimeError, OSError) as e:
+        # OSError covers requests' connection errors and the publish deadline (TimeoutError)
+        print(f'Error: {e}')
         return False
 
-    issue_id = result.get('issue', {}).get('id') or result.get('id')
-    print(f'Created issue: {issue_id}')
-
-    # Send immediately
-    send_response = requests.post(
-        f'{API_BASE}/api/{PROJECT_ID}/newsletter/issues/{issue_id}/send',
-        headers={'Content-Type': 'application/json'}
-    )
-
-    if send_response.ok:
-        send_result = send_response.json()
-        print(f'Newsletter sent! Recipients: {send_result.get("recipientCount", "unknown")}')
-        return True
-    else:
-        print(f'Error sending: {send_response.text}')
-        return False
+    timings = ', '.join(f'{step} {seconds:.1f}s' for step, seconds in result['timings'].items())
+    print(f'Issue {result["issue_id"]}: {result["status"]} '
+          f'(recipients: {result["recipients"] if result["recipients"] is not None else "unknown"}; {timings})')
+    return result['status'] not in ('failed', 'cancelled')
 
 
 def main():
@@ -270,8 +380,11 @@ def main():
         print(f'Error: Not enough tips ({len(tips)} < {TIPS_PER_NEWSLETTER})')
         sys.exit(1)
 
-    # Select tips for this issue
-    selected = select_tips(tips)
+    # Select tips for this issue, skipping ones sent in recent issues
+    history = load_history(tips)
+    print(f'History: {len(history["issues"])} issues, '
+          f'{len(recently_sent(history))} tips sent in the last {REPEAT_WINDOW_DAYS} days')
+    selected = load_contents(select_tips(tips, history=history))
     print(f'Selected {len(selected)} tips:')
     for tip in selected:
         print(f'  {tip["icon"]} {tip["title"][:50]}...')
@@ -280,8 +393,12 @@ def main():
     issue_number = get_next_issue_number()
     print(f'Issue number: #{issue_number}')
 
-    # Generate HTML
+    # Generate HTML and the plain-text part
     html = generate_html(selected, issue_number)
+    text = generate_text(selected, issue_number)
+    fragments = fragment_cache()
+    fragments.save()
+    print(f'Rendered {len(selected)} tips ({fragments.hits} cached, {fragments.misses} rendered)')
 
     # Create subject line
     subject = f'Claude Code Daily #{issue_number}: {len(selected)} Real Use Cases'
@@ -290,7 +407,7 @@ def main():
     if os.environ.get('DRY_RUN', '').lower() == 'true':
         print('\n[DRY RUN] Would send newsletter:')
         print(f'  Subject: {subject}')
-        print(f'  HTML length: {len(html)} chars')
+        print(f'  HTML length: {len(html)} chars, text length: {len(text)} chars')
         # Save preview
         preview_path = REPO_ROOT / 'automation' / 'preview.html'
         preview_path.write_text(html)
@@ -299,9 +416,10 @@ def main():
 
     # Send the newsletter
     print(f'\nSending newsletter: {subject}')
-    success = create_and_send_issue(subject, html)
+    success = create_and_send_issue(subject, html, text)
 
     if success:
+        save_history(record_issue(history, issue_number, selected))
         print('✅ Newsletter sent successfully!')
     else:
         print('❌ Failed to send newsletter')